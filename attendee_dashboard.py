@@ -4,30 +4,334 @@ DFWTRN Attendee Dashboard
 Flask web application for exploring attendee data from the SQLite database.
 """
 
-from flask import Flask, render_template, request, jsonify, redirect, url_for
+from flask import Flask, render_template, request, jsonify, redirect, url_for, abort, g, Response, stream_with_context
 import sqlite3
-from datetime import datetime
+from datetime import date
+import calendar
 import os
+import re
+import io
+import csv
+import json
+import base64
+import queue
+import hashlib
 import logging
+import threading
+import functools
+import collections
+from urllib.request import pathname2url
+from scrape_to_sql import MIGRATIONS
 
 app = Flask(__name__)
 app.config['DATABASE'] = 'attendees.db'
+app.config['DB_POOL_SIZE'] = 8
+# Seconds a request waits for a pooled connection before answering 503
+app.config['DB_POOL_TIMEOUT'] = 10.0
+app.config['PAGE_CACHE_SIZE'] = 256
+
+class SchemaOutOfDate(Exception):
+    """The database predates migrations the dashboard's queries rely on"""
+
+class PoolExhausted(Exception):
+    """Every pooled connection stayed busy for the whole acquire timeout"""
+
+class ReadOnlyPool:
+    """Per-process pool of read-only SQLite connections shared by request threads.
+
+    Connections stay open between requests, so SQLite's page cache and each
+    connection's prepared statement cache survive. They are opened with
+    mode=ro and query_only, which lets the dashboard read a WAL database while
+    a scrape is writing to it.
+    """
+    def __init__(self, db_file, size=8, timeout=10.0):
+        self.db_file = db_file
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        # Dedicated to PRAGMA data_version, which only counts other connections' commits
+        self._version_conn = None
+        self._version_ino = None
+        self._version_lock = threading.Lock()
+
+    def _uri(self):
+        return f'file:{pathname2url(os.path.abspath(self.db_file))}?mode=ro'
+
+    def _connect(self):
+        conn = sqlite3.connect(self._uri(), uri=True, timeout=10.0, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA query_only=ON')
+        conn.execute('PRAGMA mmap_size=268435456')
+        conn.execute('PRAGMA cache_size=-65536')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        # Read-only connections cannot migrate, so an older database is refused
+        # up front rather than failing later on a missing table or column
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        if version < len(MIGRATIONS):
+            conn.close()
+            raise SchemaOutOfDate(f"Database schema is at version {version}, the dashboard needs {len(MIGRATIONS)}: "
+                                  f"run `python scrape_to_sql.py --migrate`")
+        return conn
+
+    def acquire(self):
+        """Take an idle connection, opening a new one while under size; otherwise wait
+        up to timeout seconds for one and raise PoolExhausted"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolExhausted(f"All {self.size} database connections stayed busy for {self.timeout:g}s") from None
+
+    def release(self, conn):
+        # End any read transaction left open so the next request sees fresh data
+        conn.rollback()
+        self._idle.put(conn)
+
+    def data_version(self):
+        """Change counter for the database, or None if the file does not exist.
+
+        PRAGMA data_version on a connection that never writes changes whenever
+        any other connection (or process) commits. The file's inode is part of
+        the token so a replaced database counts as changed; holding the
+        connection open keeps the old inode from being reused.
+        """
+        try:
+            ino = os.stat(self.db_file).st_ino
+        except FileNotFoundError:
+            return None
+        with self._version_lock:
+            if self._version_conn is None or self._version_ino != ino:
+                if self._version_conn is not None:
+                    self._version_conn.close()
+                self._version_conn = sqlite3.connect(self._uri(), uri=True, timeout=10.0, check_same_thread=False)
+                self._version_ino = ino
+            return ino, self._version_conn.execute('PRAGMA data_version').fetchone()[0]
+
+    def close_all(self):
+        """Close idle connections"""
+        with self._version_lock:
+            if self._version_conn is not None:
+                self._version_conn.close()
+                self._version_conn = None
+        with self._lock:
+            while True:
+                try:
+                    conn = self._idle.get_nowait()
+                except queue.Empty:
+                    break
+                conn.close()
+                self._created -= 1
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool():
+    """The connection pool for the configured database"""
+    db_file = app.config['DATABASE']
+    with _pools_lock:
+        if db_file not in _pools:
+            _pools[db_file] = ReadOnlyPool(db_file, app.config['DB_POOL_SIZE'], app.config['DB_POOL_TIMEOUT'])
+        return _pools[db_file]
 
 def get_db():
-    """Get database connection"""
-    db = sqlite3.connect(app.config['DATABASE'])
-    db.row_factory = sqlite3.Row
-    return db
+    """Get the request's pooled read-only connection; released when the app context tears down"""
+    if 'db' not in g:
+        pool = get_pool()
+        try:
+            g.db = pool.acquire()
+        except SchemaOutOfDate as e:
+            logging.error(str(e))
+            abort(503, str(e))
+        except PoolExhausted as e:
+            logging.warning(str(e))
+            abort(503, str(e))
+        g.db_pool = pool
+    return g.db
+
+@app.teardown_appcontext
+def release_db(exception):
+    db = g.pop('db', None)
+    if db is not None:
+        g.pop('db_pool').release(db)
+
+def db_version():
+    """Change token for the configured database: the pool's data_version
+    counter, one PRAGMA that reads no tables"""
+    return os.path.abspath(app.config['DATABASE']), get_pool().data_version()
+
+class PageCache:
+    """Bounded LRU of rendered responses, each valid for the database version it was rendered at"""
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+page_cache = PageCache(app.config['PAGE_CACHE_SIZE'])
+
+def cached_page(view):
+    """Serve a view's rendered output from page_cache until the database changes.
+
+    Responses carry an ETag (a hash of the body) so clients and proxies can
+    revalidate with If-None-Match and get a 304. A cache hit runs no query
+    beyond the data_version check.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        # Take the version before rendering, so a page is never stored under a
+        # newer version than the data it was built from
+        version = db_version()
+        entry = page_cache.get(request.full_path, version)
+        if entry is None:
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            body = response.get_data()
+            # Headers the view set (such as cursors) are replayed with the body
+            headers = [(name, value) for name, value in response.headers if name != 'Content-Length']
+            entry = (body, headers, hashlib.sha1(body).hexdigest())
+            page_cache.put(request.full_path, version, entry)
+        body, headers, etag = entry
+        response = Response(body, headers=headers)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response.make_conditional(request)
+    return wrapper
+
+# Keyset sort orders as (SQL expression, result column) pairs. Attendee lists
+# are newest first with id breaking ties; search is best bm25 rank first.
+ATTENDEE_ORDER = (('a.event_date_iso', 'event_date_iso'), ('a.id', 'id'))
+SEARCH_ORDER = (('s.rank', 'rank'), ('a.id', 'id'))
+
+def encode_cursor(values):
+    """Opaque page cursor holding a row's sort-key values"""
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip('=')
+
+def decode_cursor(cursor, size):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        values = None
+    # Sort keys are text or numbers; anything else would reach SQLite as a bad binding
+    if (not isinstance(values, list) or len(values) != size
+            or not all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values)):
+        abort(400, 'Invalid page cursor')
+    return values
+
+def seek_page(db, sql, params, order, per_page, after=None, before=None, descending=True):
+    """Fetch one page of a keyset-paginated query; returns (rows, prev_cursor, next_cursor).
+
+    sql contains {seek} (a WHERE condition) and {order} (the ORDER BY list) and
+    ends with LIMIT ?. Pages start strictly after/before a cursor's sort key, so
+    any page costs one index seek instead of skipping OFFSET rows.
+    """
+    key = f"({', '.join(expr for expr, _ in order)})"
+    marks = f"({', '.join('?' for _ in order)})"
+    backward = bool(before)
+    ascending = descending == backward
+    seek, seek_params = '1', []
+    if before or after:
+        seek = f"{key} {'>' if ascending else '<'} {marks}"
+        seek_params = decode_cursor(before or after, len(order))
+    direction = 'ASC' if ascending else 'DESC'
+    rows = db.execute(sql.format(seek=seek, order=', '.join(f'{expr} {direction}' for expr, _ in order)),
+                      list(params) + seek_params + [per_page + 1]).fetchall()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    cursor = lambda row: encode_cursor(row[column] for _, column in order)
+    if backward:
+        rows.reverse()
+        return rows, (cursor(rows[0]) if more else None), (cursor(rows[-1]) if rows else None)
+    return rows, (cursor(rows[0]) if after and rows else None), (cursor(rows[-1]) if more else None)
+
+def date_range_filter(column):
+    """WHERE conditions and params for the request's ?from=&to= (YYYY-MM-DD, inclusive) on an ISO date column"""
+    conditions, params = [], []
+    for arg, op in (('from', '>='), ('to', '<=')):
+        value = request.args.get(arg, '').strip()
+        if not value:
+            continue
+        try:
+            value = date.fromisoformat(value).isoformat()
+        except ValueError:
+            abort(400, f'{arg} must be a YYYY-MM-DD date')
+        conditions.append(f'{column} {op} ?')
+        params.append(value)
+    return conditions, params
+
+def fts_query(text, column=None):
+    """Turn free text into an FTS5 query: every word must match as a prefix"""
+    terms = ' '.join(f'"{word}"*' for word in re.findall(r'\w+', text))
+    if not terms:
+        return None
+    return f'{{{column}}} : ({terms})' if column else terms
+
+def search_attendees(db, match, limit, after=None, before=None, event_id=None):
+    """Best-ranked (bm25) page of attendees for an FTS5 match expression.
+
+    Returns (rows, prev_cursor, next_cursor, total matches).
+    """
+    event_filter = 'AND a.event_id = ?' if event_id else ''
+    params = (match, event_id) if event_id else (match,)
+    rows, prev_cursor, next_cursor = seek_page(db, f'''
+        SELECT a.*, e.event_name, s.rank
+        FROM attendee_search s
+        JOIN attendee_details a ON a.id = s.rowid
+        LEFT JOIN events e ON a.event_id = e.id
+        WHERE attendee_search MATCH ? {event_filter} AND {{seek}}
+        ORDER BY {{order}}
+        LIMIT ?
+    ''', params, SEARCH_ORDER, limit, after, before, descending=False)
+    total = db.execute(f'''
+        SELECT COUNT(*)
+        FROM attendee_search s
+        JOIN attendees a ON a.id = s.rowid
+        WHERE attendee_search MATCH ? {event_filter}
+    ''', params).fetchone()[0]
+    return rows, prev_cursor, next_cursor, total
 
 @app.route('/')
+@cached_page
 def index():
     """Dashboard overview page"""
     db = get_db()
     
-    # Get summary statistics
-    total_attendees = db.execute('SELECT COUNT(*) FROM attendees').fetchone()[0]
-    total_events = db.execute('SELECT COUNT(*) FROM events').fetchone()[0]
-    total_profiles = db.execute('SELECT COUNT(*) FROM attendee_profiles').fetchone()[0]
+    # Summary counts are maintained by triggers, so this is a single-row read
+    stats = db.execute('SELECT * FROM dashboard_stats WHERE id = 1').fetchone()
+    total_attendees = stats['total_attendees']
+    anonymous_count = stats['anonymous_attendees']
+    named_count = total_attendees - anonymous_count
     
     # Get most recent event
     recent_event = db.execute('''
@@ -36,208 +340,268 @@ def index():
         LIMIT 1
     ''').fetchone()
     
-    # Get top attendees by name frequency
+    # Get top attendees: the first rows of the members attendance index
     top_names = db.execute('''
-        SELECT first_name, last_name, COUNT(*) as count 
-        FROM attendees 
-        WHERE is_anonymous = 0 
-        GROUP BY first_name, last_name 
-        ORDER BY count DESC 
+        SELECT id, full_name, first_name, last_name, attendance_count as count
+        FROM members
+        WHERE attendance_count > 0
+        ORDER BY attendance_count DESC
         LIMIT 10
     ''').fetchall()
     
-    # Get anonymous vs named attendees
-    anonymous_count = db.execute('''
-        SELECT COUNT(*) FROM attendees WHERE is_anonymous = 1
-    ''').fetchone()[0]
-    
-    named_count = total_attendees - anonymous_count
-    
-    db.close()
-    
     return render_template('index.html',
                          total_attendees=total_attendees,
-                         total_events=total_events,
-                         total_profiles=total_profiles,
+                         total_events=stats['total_events'],
+                         total_profiles=stats['total_profiles'],
                          recent_event=recent_event,
                          top_names=top_names,
                          anonymous_count=anonymous_count,
                          named_count=named_count)
 
 @app.route('/event/<int:event_id>')
+@cached_page
 def event_detail(event_id):
     """Show attendees for a specific event"""
-    page = request.args.get('page', 1, type=int)
     per_page = 20
-    offset = (page - 1) * per_page
     db = get_db()
     # Get event info
     event = db.execute('SELECT * FROM events WHERE id = ?', (event_id,)).fetchone()
     if not event:
         logging.error(f"Event not found: {event_id}")
-        return render_template('event.html', event=None, attendees=[], page=1, total_pages=1, total_attendees=0, error="Event not found")
+        return render_template('event.html', event=None, attendees=[], prev_cursor=None, next_cursor=None, total_attendees=0, error="Event not found")
     # Get attendees with pagination and richer profile fields (no membership_level)
-    attendees = db.execute('''
-        SELECT a.*, ap.email, ap.company, ap.job_title, ap.phone
-        FROM attendees a
-        LEFT JOIN attendee_profiles ap ON a.id = ap.attendee_id
-        WHERE a.event_id = ?
-        ORDER BY a.event_date DESC, a.full_name
-        LIMIT ? OFFSET ?
-    ''', (event_id, per_page, offset)).fetchall()
+    attendees, prev_cursor, next_cursor = seek_page(db, '''
+        SELECT a.*
+        FROM attendee_details a
+        WHERE a.event_id = ? AND {seek}
+        ORDER BY {order}
+        LIMIT ?
+    ''', (event_id,), ATTENDEE_ORDER, per_page, request.args.get('after'), request.args.get('before'))
     if not attendees:
         logging.warning(f"No attendees found for event {event_id}")
-    # Get total count for pagination
-    total_attendees = db.execute('''
-        SELECT COUNT(*) FROM attendees WHERE event_id = ?
-    ''', (event_id,)).fetchone()[0]
-    total_pages = (total_attendees + per_page - 1) // per_page
-    db.close()
+    # Get total count for the header
+    stats = db.execute('SELECT attendees FROM event_stats WHERE event_id = ?', (event_id,)).fetchone()
+    total_attendees = stats['attendees'] if stats else 0
     return render_template('event.html',
                          event=event,
                          attendees=attendees,
-                         page=page,
-                         total_pages=total_pages,
+                         prev_cursor=prev_cursor,
+                         next_cursor=next_cursor,
                          total_attendees=total_attendees,
                          error=None)
 
 @app.route('/search')
+@cached_page
 def search():
-    """Search attendees by name"""
+    """Search attendees by name, company, job title or location"""
     query = request.args.get('q', '').strip()
-    page = request.args.get('page', 1, type=int)
     per_page = 20
-    offset = (page - 1) * per_page
     if not query:
         return redirect(url_for('index'))
-    db = get_db()
-    # Search in attendees table with richer profile fields (no membership_level)
-    attendees = db.execute('''
-        SELECT a.*, e.event_name, ap.email, ap.company, ap.job_title, ap.phone
-        FROM attendees a
-        LEFT JOIN events e ON a.event_id = e.id
-        LEFT JOIN attendee_profiles ap ON a.id = ap.attendee_id
-        WHERE (a.full_name LIKE ? OR a.first_name LIKE ? OR a.last_name LIKE ?)
-        ORDER BY a.event_date DESC, a.full_name
-        LIMIT ? OFFSET ?
-    ''', (f'%{query}%', f'%{query}%', f'%{query}%', per_page, offset)).fetchall()
-    # Get total count for pagination
-    total_results = db.execute('''
-        SELECT COUNT(*) FROM attendees 
-        WHERE (full_name LIKE ? OR first_name LIKE ? OR last_name LIKE ?)
-    ''', (f'%{query}%', f'%{query}%', f'%{query}%')).fetchone()[0]
-    total_pages = (total_results + per_page - 1) // per_page
-    db.close()
+    match = fts_query(query)
+    attendees, prev_cursor, next_cursor, total_results = [], None, None, 0
+    if match:
+        db = get_db()
+        attendees, prev_cursor, next_cursor, total_results = search_attendees(
+            db, match, per_page, request.args.get('after'), request.args.get('before'))
     return render_template('search.html',
                          query=query,
                          attendees=attendees,
-                         page=page,
-                         total_pages=total_pages,
+                         prev_cursor=prev_cursor,
+                         next_cursor=next_cursor,
                          total_results=total_results)
 
 @app.route('/api/attendees')
+@cached_page
 def api_attendees():
-    """JSON API for attendees"""
+    """JSON API for attendees, newest first, paged with after/before cursors"""
     event_id = request.args.get('event_id', type=int)
-    limit = request.args.get('limit', 50, type=int)
-    
-    db = get_db()
+    limit = min(max(request.args.get('limit', 50, type=int), 1), 500)
+    after = request.args.get('after')
+    before = request.args.get('before')
     
+    conditions, params = date_range_filter('a.event_date_iso')
     if event_id:
-        attendees = db.execute('''
-            SELECT a.*, ap.email, ap.company, ap.job_title
-            FROM attendees a
-            LEFT JOIN attendee_profiles ap ON a.id = ap.attendee_id
-            WHERE a.event_id = ?
-            ORDER BY a.event_date DESC, a.full_name
-            LIMIT ?
-        ''', (event_id, limit)).fetchall()
-    else:
-        attendees = db.execute('''
-            SELECT a.*, e.event_name, ap.email, ap.company, ap.job_title
-            FROM attendees a
-            LEFT JOIN events e ON a.event_id = e.id
-            LEFT JOIN attendee_profiles ap ON a.id = ap.attendee_id
-            ORDER BY a.event_date DESC, a.full_name
-            LIMIT ?
-        ''', (limit,)).fetchall()
+        conditions.insert(0, 'a.event_id = ?')
+        params.insert(0, event_id)
+    where = ' AND '.join(conditions + ['{seek}'])
     
-    db.close()
-    
-    # Convert to dict for JSON serialization
-    result = []
-    for attendee in attendees:
-        attendee_dict = dict(attendee)
-        # Convert datetime objects to strings
-        if attendee_dict.get('created_at'):
-            attendee_dict['created_at'] = attendee_dict['created_at']
-        result.append(attendee_dict)
+    db = get_db()
+    attendees, prev_cursor, next_cursor = seek_page(db, f'''
+        SELECT a.*, e.event_name
+        FROM attendee_details a
+        LEFT JOIN events e ON a.event_id = e.id
+        WHERE {where}
+        ORDER BY {{order}}
+        LIMIT ?
+    ''', params, ATTENDEE_ORDER, limit, after, before)
     
-    return jsonify(result)
+    # A bare list, as this endpoint has always returned; cursors travel in headers
+    response = jsonify([dict(attendee) for attendee in attendees])
+    links = []
+    for rel, param, cursor in (('prev', 'before', prev_cursor), ('next', 'after', next_cursor)):
+        if cursor:
+            response.headers[f'X-{rel.capitalize()}-Cursor'] = cursor
+            args = {k: v for k, v in request.args.items() if k not in ('after', 'before')}
+            links.append(f'<{url_for("api_attendees", **args, **{param: cursor})}>; rel="{rel}"')
+    if links:
+        response.headers['Link'] = ', '.join(links)
+    return response
+
+@app.route('/api/search')
+@cached_page
+def api_search():
+    """JSON API for ranked full-text attendee search"""
+    query = request.args.get('q', '').strip()
+    company = request.args.get('company', '').strip()
+    event_id = request.args.get('event_id', type=int)
+    per_page = min(max(request.args.get('per_page', 20, type=int), 1), 100)
+    terms = [m for m in (fts_query(query), fts_query(company, 'company')) if m]
+    if not terms:
+        return jsonify({'success': False, 'error': 'q or company is required', 'code': 400}), 400
+
+    db = get_db()
+    attendees, prev_cursor, next_cursor, total = search_attendees(
+        db, ' AND '.join(terms), per_page, request.args.get('after'), request.args.get('before'), event_id)
+
+    return jsonify({
+        'success': True,
+        'data': [dict(attendee) for attendee in attendees],
+        'meta': {
+            'total': total,
+            'per_page': per_page,
+            'prev_cursor': prev_cursor,
+            'next_cursor': next_cursor,
+            'query': query,
+            'filters': {'company': company or None, 'event_id': event_id},
+        },
+    })
+
+EXPORT_COLUMNS = [
+    'id', 'event_id', 'event_name', 'event_date', 'event_date_iso', 'full_name', 'first_name', 'last_name',
+    'profile_url', 'is_anonymous', 'guest_count', 'email', 'phone', 'company', 'job_title', 'location',
+]
+EXPORT_BATCH_SIZE = 1000
+
+def export_rows(cursor):
+    """Yield batches of rows from a cursor so only one batch is in memory at a time"""
+    while True:
+        rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+        if not rows:
+            return
+        yield rows
+
+def ndjson_lines(cursor):
+    for rows in export_rows(cursor):
+        yield ''.join(json.dumps(dict(row)) + '\n' for row in rows)
+
+def csv_lines(cursor):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_COLUMNS)
+    for rows in export_rows(cursor):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header-only when nothing matched
+    if buffer.tell():
+        yield buffer.getvalue()
+
+EXPORT_FORMATS = {
+    'ndjson': (ndjson_lines, 'application/x-ndjson'),
+    'csv': (csv_lines, 'text/csv; charset=utf-8'),
+}
+
+@app.route('/api/export')
+def api_export():
+    """Stream every matching attendee as NDJSON or CSV, in id order, without a row limit"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        abort(400, 'format must be ndjson or csv')
+    event_id = request.args.get('event_id', type=int)
+    conditions, params = date_range_filter('a.event_date_iso')
+    if event_id:
+        conditions.insert(0, 'a.event_id = ?')
+        params.insert(0, event_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    db = get_db()
+    cursor = db.execute(f'''
+        SELECT a.id, a.event_id, e.event_name, a.event_date, a.event_date_iso, a.full_name, a.first_name, a.last_name,
+               a.profile_url, a.is_anonymous, a.guest_count, a.email, a.phone, a.company, a.job_title, a.location
+        FROM attendee_details a
+        LEFT JOIN events e ON a.event_id = e.id
+        {where}
+        ORDER BY a.id
+    ''', params)
+    lines, mimetype = EXPORT_FORMATS[export_format]
+    # stream_with_context keeps the request (and its pooled connection) alive until the last row is sent
+    return Response(stream_with_context(lines(cursor)), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename=attendees.{export_format}'})
 
 @app.route('/api/events')
+@cached_page
 def api_events():
     """JSON API for events"""
     db = get_db()
     events = db.execute('SELECT * FROM events ORDER BY created_at DESC').fetchall()
-    db.close()
     
     result = [dict(event) for event in events]
     return jsonify(result)
 
 @app.route('/events')
+@cached_page
 def events():
-    """List all events"""
+    """List all events, optionally within ?from=&to= dates"""
+    conditions, params = date_range_filter('event_date_iso')
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
     db = get_db()
-    events = db.execute('SELECT * FROM events ORDER BY event_date DESC').fetchall()
-    db.close()
-    return render_template('events.html', events=events)
+    events = db.execute(f'SELECT * FROM events {where} ORDER BY event_date_iso DESC', params).fetchall()
+    return render_template('events.html', events=events,
+                           date_from=request.args.get('from', ''), date_to=request.args.get('to', ''))
 
 @app.route('/attendees')
+@cached_page
 def attendees():
     """Browse all attendees with pagination"""
-    page = request.args.get('page', 1, type=int)
     per_page = 20
-    offset = (page - 1) * per_page
     db = get_db()
-    attendees = db.execute('''
-        SELECT a.*, ap.email, ap.company, ap.job_title, ap.phone, e.event_name
-        FROM attendees a
-        LEFT JOIN attendee_profiles ap ON a.id = ap.attendee_id
+    attendees, prev_cursor, next_cursor = seek_page(db, '''
+        SELECT a.*, e.event_name
+        FROM attendee_details a
         LEFT JOIN events e ON a.event_id = e.id
-        ORDER BY a.event_date DESC, a.full_name
-        LIMIT ? OFFSET ?
-    ''', (per_page, offset)).fetchall()
-    total_attendees = db.execute('SELECT COUNT(*) FROM attendees').fetchone()[0]
-    total_pages = (total_attendees + per_page - 1) // per_page
-    db.close()
-    return render_template('attendees.html', attendees=attendees, page=page, total_pages=total_pages, total_attendees=total_attendees)
+        WHERE {seek}
+        ORDER BY {order}
+        LIMIT ?
+    ''', (), ATTENDEE_ORDER, per_page, request.args.get('after'), request.args.get('before'))
+    total_attendees = db.execute('SELECT total_attendees FROM dashboard_stats WHERE id = 1').fetchone()[0]
+    return render_template('attendees.html', attendees=attendees, prev_cursor=prev_cursor, next_cursor=next_cursor, total_attendees=total_attendees)
 
 @app.route('/attendee/<int:attendee_id>')
+@cached_page
 def attendee_detail(attendee_id):
     """Show detail for a single attendee"""
     db = get_db()
     attendee = db.execute('''
-        SELECT a.*, ap.email, ap.company, ap.job_title, ap.phone, ap.bio, ap.member_since, ap.location, ap.skills, ap.certifications, ap.profile_url as external_profile_url
-        FROM attendees a
-        LEFT JOIN attendee_profiles ap ON a.id = ap.attendee_id
+        SELECT a.*, CASE WHEN a.profile_id IS NOT NULL THEN a.profile_url END as external_profile_url
+        FROM attendee_details a
         WHERE a.id = ?
     ''', (attendee_id,)).fetchone()
-    db.close()
     if not attendee:
         return render_template('attendee.html', attendee=None, error="Attendee not found")
     return render_template('attendee.html', attendee=attendee, error=None)
 
 @app.template_filter('date_format')
-def date_format(value):
-    """Format date for display"""
+def date_format(value, fallback=''):
+    """Format an ISO (YYYY-MM-DD) date column for display; fallback is shown when it is empty"""
     if not value:
-        return ''
+        return fallback or ''
+    # The scraper stores dates pre-parsed, so this is string slicing, not strptime
     try:
-        # Parse the date string and format it
-        dt = datetime.strptime(value, '%d %b %Y')
-        return dt.strftime('%B %d, %Y')
-    except:
+        year, month, day = value.split('-')
+        return f'{calendar.month_name[int(month)]} {day}, {year}'
+    except (ValueError, IndexError):
         return value
 
 if __name__ == '__main__':
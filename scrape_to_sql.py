@@ -5,22 +5,41 @@ Scrapes attendee lists and deep profile data, inserting all discovered data dire
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.html
+import asyncio
 import time
+import random
 import argparse
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import urljoin, urlparse, parse_qs
 import sqlite3
 import re
 import logging
 import json
+import os
+import gzip
+import hashlib
 import concurrent.futures
+import multiprocessing
 import signal
 import threading
 import queue
+import collections
+import functools
+import itertools
 
 DB_FILE = 'attendees.db'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# HTTP politeness: the site answers these when we go too fast
+THROTTLE_STATUSES = (429, 503)
+REQUEST_TIMEOUT = 30  # seconds
+RETRY_BACKOFF = 1.0  # seconds; doubled per attempt and fully jittered
+MAX_RETRY_AFTER = 300  # seconds; cap on a server-requested pause
 
 # Global flag for graceful shutdown
 shutdown_requested = False
@@ -83,11 +102,409 @@ CREATE TABLE IF NOT EXISTS events (
 );
 '''
 
+# Attendee list dates look like "12 Mar 2024"
+EVENT_DATE_FORMATS = ('%d %b %Y', '%d %B %Y')
+
+def parse_event_date(text):
+    """ISO-8601 (YYYY-MM-DD) form of a scraped event date, or '' if it cannot be parsed"""
+    text = (text or '').strip()
+    for fmt in EVENT_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return ''
+
+def _backfill_dates(conn, table):
+    conn.create_function('parse_event_date', 1, parse_event_date, deterministic=True)
+    return conn.execute(f'''
+        UPDATE {table} SET event_date_iso = parse_event_date(event_date)
+        WHERE event_date_iso = '' AND parse_event_date(event_date) != ''
+    ''').rowcount
+
+def _backfill_attendee_dates(conn):
+    _backfill_dates(conn, 'attendees')
+
+def backfill_event_dates(conn):
+    """Fill event_date_iso wherever it is still empty; returns rows updated per table"""
+    return {table: _backfill_dates(conn, table) for table in ('attendees', 'events')}
+
+def member_key(profile_url, full_name, is_anonymous=False):
+    """Identity of the person behind an attendance row: their profile URL, else
+    their case- and whitespace-normalized name; None for anonymous attendees"""
+    if profile_url:
+        return profile_url
+    if is_anonymous or not full_name:
+        return None
+    return 'name:' + ' '.join(full_name.casefold().split())
+
+def backfill_members(conn):
+    """Link attendees without a member_id to their member (creating members as
+    needed) and recount attendances; returns the number of attendees linked"""
+    conn.create_function('member_key', 3, member_key, deterministic=True)
+    # Newest attendance first, so a member takes the latest spelling of its name
+    # (the writer's MEMBER_INSERT_SQL follows the same rule)
+    conn.execute('''
+        INSERT OR IGNORE INTO members (member_key, profile_url, full_name, first_name, last_name)
+        SELECT member_key(profile_url, full_name, is_anonymous) AS k, profile_url, full_name, first_name, last_name
+        FROM attendees WHERE member_id IS NULL AND k IS NOT NULL
+        ORDER BY id DESC
+    ''')
+    linked = conn.execute('''
+        UPDATE attendees SET member_id = (
+            SELECT id FROM members WHERE member_key = member_key(attendees.profile_url, attendees.full_name, attendees.is_anonymous))
+        WHERE member_id IS NULL AND member_key(profile_url, full_name, is_anonymous) IS NOT NULL
+    ''').rowcount
+    conn.execute('''
+        UPDATE members SET attendance_count = (SELECT COUNT(*) FROM attendees WHERE member_id = members.id)
+    ''')
+    return linked
+
+# --- SCHEMA MIGRATIONS ---
+# Step N upgrades a database from PRAGMA user_version N-1 to N. Steps are SQL
+# scripts (or callables taking the connection, for data backfills) and run
+# inside one transaction with the version bump; only ever append new steps so
+# existing databases upgrade in order.
+MIGRATIONS = [
+    # 1: indexes for the dashboard's list, detail and summary queries
+    '''
+    CREATE INDEX IF NOT EXISTS idx_attendee_profiles_attendee_id ON attendee_profiles(attendee_id);
+    CREATE INDEX IF NOT EXISTS idx_attendees_date_name ON attendees(event_date DESC, full_name);
+    CREATE INDEX IF NOT EXISTS idx_attendees_event_date_name ON attendees(event_id, event_date DESC, full_name);
+    CREATE INDEX IF NOT EXISTS idx_attendees_anonymous_name ON attendees(is_anonymous, first_name, last_name);
+    CREATE INDEX IF NOT EXISTS idx_events_created_at ON events(created_at);
+    CREATE INDEX IF NOT EXISTS idx_events_event_date ON events(event_date);
+    ''',
+    # 2: full-text search over attendee names and profile company/title/location.
+    # rowid is attendees.id; triggers keep it in step with both tables.
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS attendee_search USING fts5(
+        full_name, company, job_title, location,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    );
+    INSERT INTO attendee_search (attendee_search, rank) VALUES ('rank', 'bm25(10.0, 4.0, 4.0, 1.0)');
+    INSERT INTO attendee_search (rowid, full_name, company, job_title, location)
+        SELECT a.id, a.full_name, ap.company, ap.job_title, ap.location
+        FROM attendees a
+        LEFT JOIN attendee_profiles ap
+            ON ap.id = (SELECT MAX(id) FROM attendee_profiles WHERE attendee_id = a.id);
+    CREATE TRIGGER IF NOT EXISTS attendees_search_insert AFTER INSERT ON attendees BEGIN
+        INSERT INTO attendee_search (rowid, full_name) VALUES (NEW.id, NEW.full_name);
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendees_search_update AFTER UPDATE OF full_name ON attendees BEGIN
+        UPDATE attendee_search SET full_name = NEW.full_name WHERE rowid = NEW.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendees_search_delete AFTER DELETE ON attendees BEGIN
+        DELETE FROM attendee_search WHERE rowid = OLD.id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendee_profiles_search_insert AFTER INSERT ON attendee_profiles BEGIN
+        UPDATE attendee_search SET company = NEW.company, job_title = NEW.job_title, location = NEW.location
+        WHERE rowid = NEW.attendee_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendee_profiles_search_update
+    AFTER UPDATE OF attendee_id, company, job_title, location ON attendee_profiles BEGIN
+        UPDATE attendee_search SET company = NULL, job_title = NULL, location = NULL
+        WHERE rowid = OLD.attendee_id;
+        UPDATE attendee_search SET company = NEW.company, job_title = NEW.job_title, location = NEW.location
+        WHERE rowid = NEW.attendee_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendee_profiles_search_delete AFTER DELETE ON attendee_profiles BEGIN
+        UPDATE attendee_search SET company = NULL, job_title = NULL, location = NULL
+        WHERE rowid = OLD.attendee_id;
+    END;
+    ''',
+    # 3: sortable event date for keyset pagination (newest first, id as tiebreak)
+    '''
+    ALTER TABLE attendees ADD COLUMN event_date_iso TEXT NOT NULL DEFAULT '';
+    DROP INDEX IF EXISTS idx_attendees_date_name;
+    DROP INDEX IF EXISTS idx_attendees_event_date_name;
+    CREATE INDEX IF NOT EXISTS idx_attendees_date_iso_id ON attendees(event_date_iso DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_attendees_event_date_iso_id ON attendees(event_id, event_date_iso DESC, id DESC);
+    ''',
+    _backfill_attendee_dates,
+    # 5: sortable event date on events too, for date-range listings
+    '''
+    ALTER TABLE events ADD COLUMN event_date_iso TEXT NOT NULL DEFAULT '';
+    DROP INDEX IF EXISTS idx_events_event_date;
+    CREATE INDEX IF NOT EXISTS idx_events_event_date_iso ON events(event_date_iso);
+    ''',
+    backfill_event_dates,
+    # 7: precomputed counts for the dashboard landing page and event pages,
+    # kept current by triggers so reads never aggregate the attendees table
+    '''
+    CREATE TABLE IF NOT EXISTS dashboard_stats (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total_attendees INTEGER NOT NULL DEFAULT 0,
+        anonymous_attendees INTEGER NOT NULL DEFAULT 0,
+        total_events INTEGER NOT NULL DEFAULT 0,
+        total_profiles INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS event_stats (
+        event_id INTEGER PRIMARY KEY,
+        attendees INTEGER NOT NULL DEFAULT 0,
+        anonymous_attendees INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE IF NOT EXISTS attendee_name_counts (
+        first_name TEXT NOT NULL,
+        last_name TEXT NOT NULL,
+        attendances INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (first_name, last_name)
+    );
+    CREATE INDEX IF NOT EXISTS idx_attendee_name_counts_attendances ON attendee_name_counts(attendances DESC);
+    INSERT INTO dashboard_stats (id, total_attendees, anonymous_attendees, total_events, total_profiles)
+        SELECT 1,
+            (SELECT COUNT(*) FROM attendees),
+            (SELECT COUNT(*) FROM attendees WHERE is_anonymous IS 1),
+            (SELECT COUNT(*) FROM events),
+            (SELECT COUNT(*) FROM attendee_profiles);
+    INSERT INTO event_stats (event_id, attendees, anonymous_attendees)
+        SELECT event_id, COUNT(*), SUM(is_anonymous IS 1) FROM attendees
+        WHERE event_id IS NOT NULL GROUP BY event_id;
+    INSERT INTO attendee_name_counts (first_name, last_name, attendances)
+        SELECT COALESCE(first_name, ''), COALESCE(last_name, ''), COUNT(*) FROM attendees
+        WHERE is_anonymous IS 0 GROUP BY 1, 2;
+    CREATE TRIGGER IF NOT EXISTS attendees_stats_insert AFTER INSERT ON attendees BEGIN
+        UPDATE dashboard_stats SET total_attendees = total_attendees + 1,
+            anonymous_attendees = anonymous_attendees + (NEW.is_anonymous IS 1);
+        INSERT INTO event_stats (event_id, attendees, anonymous_attendees)
+            SELECT NEW.event_id, 1, NEW.is_anonymous IS 1 WHERE NEW.event_id IS NOT NULL
+            ON CONFLICT (event_id) DO UPDATE SET attendees = attendees + 1,
+                anonymous_attendees = anonymous_attendees + excluded.anonymous_attendees;
+        INSERT INTO attendee_name_counts (first_name, last_name, attendances)
+            SELECT COALESCE(NEW.first_name, ''), COALESCE(NEW.last_name, ''), 1 WHERE NEW.is_anonymous IS 0
+            ON CONFLICT (first_name, last_name) DO UPDATE SET attendances = attendances + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendees_stats_delete AFTER DELETE ON attendees BEGIN
+        UPDATE dashboard_stats SET total_attendees = total_attendees - 1,
+            anonymous_attendees = anonymous_attendees - (OLD.is_anonymous IS 1);
+        UPDATE event_stats SET attendees = attendees - 1,
+            anonymous_attendees = anonymous_attendees - (OLD.is_anonymous IS 1)
+        WHERE event_id = OLD.event_id;
+        UPDATE attendee_name_counts SET attendances = attendances - 1
+        WHERE OLD.is_anonymous IS 0
+            AND first_name = COALESCE(OLD.first_name, '') AND last_name = COALESCE(OLD.last_name, '');
+        DELETE FROM attendee_name_counts WHERE attendances <= 0
+            AND first_name = COALESCE(OLD.first_name, '') AND last_name = COALESCE(OLD.last_name, '');
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendees_stats_update
+    AFTER UPDATE OF event_id, is_anonymous, first_name, last_name ON attendees BEGIN
+        UPDATE dashboard_stats SET anonymous_attendees = anonymous_attendees
+            - (OLD.is_anonymous IS 1) + (NEW.is_anonymous IS 1);
+        UPDATE event_stats SET attendees = attendees - 1,
+            anonymous_attendees = anonymous_attendees - (OLD.is_anonymous IS 1)
+        WHERE event_id = OLD.event_id;
+        INSERT INTO event_stats (event_id, attendees, anonymous_attendees)
+            SELECT NEW.event_id, 1, NEW.is_anonymous IS 1 WHERE NEW.event_id IS NOT NULL
+            ON CONFLICT (event_id) DO UPDATE SET attendees = attendees + 1,
+                anonymous_attendees = anonymous_attendees + excluded.anonymous_attendees;
+        UPDATE attendee_name_counts SET attendances = attendances - 1
+        WHERE OLD.is_anonymous IS 0
+            AND first_name = COALESCE(OLD.first_name, '') AND last_name = COALESCE(OLD.last_name, '');
+        DELETE FROM attendee_name_counts WHERE attendances <= 0
+            AND first_name = COALESCE(OLD.first_name, '') AND last_name = COALESCE(OLD.last_name, '');
+        INSERT INTO attendee_name_counts (first_name, last_name, attendances)
+            SELECT COALESCE(NEW.first_name, ''), COALESCE(NEW.last_name, ''), 1 WHERE NEW.is_anonymous IS 0
+            ON CONFLICT (first_name, last_name) DO UPDATE SET attendances = attendances + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS events_stats_insert AFTER INSERT ON events BEGIN
+        UPDATE dashboard_stats SET total_events = total_events + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS events_stats_delete AFTER DELETE ON events BEGIN
+        UPDATE dashboard_stats SET total_events = total_events - 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendee_profiles_stats_insert AFTER INSERT ON attendee_profiles BEGIN
+        UPDATE dashboard_stats SET total_profiles = total_profiles + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendee_profiles_stats_delete AFTER DELETE ON attendee_profiles BEGIN
+        UPDATE dashboard_stats SET total_profiles = total_profiles - 1;
+    END;
+    ''',
+    # 8: profiles belong to a person (profile_url), not to the attendance row
+    # that first fetched them. attendee_details is the one place that join is
+    # spelled out; the search index is rebuilt on the same key.
+    '''
+    CREATE INDEX IF NOT EXISTS idx_attendees_profile_url ON attendees(profile_url);
+    CREATE VIEW IF NOT EXISTS attendee_details AS
+        SELECT a.*, ap.id AS profile_id, ap.email, ap.phone, ap.company, ap.job_title, ap.bio,
+               ap.member_since, ap.location, ap.skills, ap.certifications
+        FROM attendees a
+        LEFT JOIN attendee_profiles ap ON ap.profile_url = a.profile_url;
+    DROP TRIGGER IF EXISTS attendees_search_insert;
+    DROP TRIGGER IF EXISTS attendees_search_update;
+    DROP TRIGGER IF EXISTS attendee_profiles_search_insert;
+    DROP TRIGGER IF EXISTS attendee_profiles_search_update;
+    DROP TRIGGER IF EXISTS attendee_profiles_search_delete;
+    CREATE TRIGGER attendees_search_insert AFTER INSERT ON attendees BEGIN
+        INSERT INTO attendee_search (rowid, full_name, company, job_title, location)
+            SELECT NEW.id, NEW.full_name, ap.company, ap.job_title, ap.location
+            FROM (SELECT NEW.profile_url AS profile_url) n
+            LEFT JOIN attendee_profiles ap ON ap.profile_url = n.profile_url;
+    END;
+    CREATE TRIGGER attendees_search_update AFTER UPDATE OF full_name, profile_url ON attendees BEGIN
+        DELETE FROM attendee_search WHERE rowid = OLD.id;
+        INSERT INTO attendee_search (rowid, full_name, company, job_title, location)
+            SELECT NEW.id, NEW.full_name, ap.company, ap.job_title, ap.location
+            FROM (SELECT NEW.profile_url AS profile_url) n
+            LEFT JOIN attendee_profiles ap ON ap.profile_url = n.profile_url;
+    END;
+    CREATE TRIGGER attendee_profiles_search_insert AFTER INSERT ON attendee_profiles BEGIN
+        UPDATE attendee_search SET company = NEW.company, job_title = NEW.job_title, location = NEW.location
+        WHERE rowid IN (SELECT id FROM attendees WHERE profile_url = NEW.profile_url);
+    END;
+    CREATE TRIGGER attendee_profiles_search_update
+    AFTER UPDATE OF profile_url, company, job_title, location ON attendee_profiles BEGIN
+        UPDATE attendee_search SET company = NULL, job_title = NULL, location = NULL
+        WHERE rowid IN (SELECT id FROM attendees WHERE profile_url = OLD.profile_url);
+        UPDATE attendee_search SET company = NEW.company, job_title = NEW.job_title, location = NEW.location
+        WHERE rowid IN (SELECT id FROM attendees WHERE profile_url = NEW.profile_url);
+    END;
+    CREATE TRIGGER attendee_profiles_search_delete AFTER DELETE ON attendee_profiles BEGIN
+        UPDATE attendee_search SET company = NULL, job_title = NULL, location = NULL
+        WHERE rowid IN (SELECT id FROM attendees WHERE profile_url = OLD.profile_url);
+    END;
+    DELETE FROM attendee_search;
+    INSERT INTO attendee_search (rowid, full_name, company, job_title, location)
+        SELECT id, full_name, company, job_title, location FROM attendee_details;
+    ''',
+    # 9: one row per person across events, keyed by member_key(). members
+    # replaces attendee_name_counts, which merged namesakes and split people
+    # whose name was spelled differently between events.
+    '''
+    CREATE TABLE IF NOT EXISTS members (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        member_key TEXT NOT NULL UNIQUE,
+        profile_url TEXT,
+        full_name TEXT,
+        first_name TEXT,
+        last_name TEXT,
+        attendance_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS idx_members_attendance_count ON members(attendance_count DESC);
+    ALTER TABLE attendees ADD COLUMN member_id INTEGER REFERENCES members(id);
+    CREATE INDEX IF NOT EXISTS idx_attendees_member_id ON attendees(member_id);
+    DROP TRIGGER IF EXISTS attendees_stats_insert;
+    DROP TRIGGER IF EXISTS attendees_stats_delete;
+    DROP TRIGGER IF EXISTS attendees_stats_update;
+    DROP TABLE IF EXISTS attendee_name_counts;
+    CREATE TRIGGER attendees_stats_insert AFTER INSERT ON attendees BEGIN
+        UPDATE dashboard_stats SET total_attendees = total_attendees + 1,
+            anonymous_attendees = anonymous_attendees + (NEW.is_anonymous IS 1);
+        INSERT INTO event_stats (event_id, attendees, anonymous_attendees)
+            SELECT NEW.event_id, 1, NEW.is_anonymous IS 1 WHERE NEW.event_id IS NOT NULL
+            ON CONFLICT (event_id) DO UPDATE SET attendees = attendees + 1,
+                anonymous_attendees = anonymous_attendees + excluded.anonymous_attendees;
+    END;
+    CREATE TRIGGER attendees_stats_delete AFTER DELETE ON attendees BEGIN
+        UPDATE dashboard_stats SET total_attendees = total_attendees - 1,
+            anonymous_attendees = anonymous_attendees - (OLD.is_anonymous IS 1);
+        UPDATE event_stats SET attendees = attendees - 1,
+            anonymous_attendees = anonymous_attendees - (OLD.is_anonymous IS 1)
+        WHERE event_id = OLD.event_id;
+    END;
+    CREATE TRIGGER attendees_stats_update AFTER UPDATE OF event_id, is_anonymous ON attendees BEGIN
+        UPDATE dashboard_stats SET anonymous_attendees = anonymous_attendees
+            - (OLD.is_anonymous IS 1) + (NEW.is_anonymous IS 1);
+        UPDATE event_stats SET attendees = attendees - 1,
+            anonymous_attendees = anonymous_attendees - (OLD.is_anonymous IS 1)
+        WHERE event_id = OLD.event_id;
+        INSERT INTO event_stats (event_id, attendees, anonymous_attendees)
+            SELECT NEW.event_id, 1, NEW.is_anonymous IS 1 WHERE NEW.event_id IS NOT NULL
+            ON CONFLICT (event_id) DO UPDATE SET attendees = attendees + 1,
+                anonymous_attendees = anonymous_attendees + excluded.anonymous_attendees;
+    END;
+    ''',
+    backfill_members,
+    # 11: attendance counts follow attendees.member_id from here on
+    '''
+    CREATE TRIGGER IF NOT EXISTS attendees_members_insert AFTER INSERT ON attendees
+    WHEN NEW.member_id IS NOT NULL BEGIN
+        UPDATE members SET attendance_count = attendance_count + 1 WHERE id = NEW.member_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendees_members_delete AFTER DELETE ON attendees
+    WHEN OLD.member_id IS NOT NULL BEGIN
+        UPDATE members SET attendance_count = attendance_count - 1 WHERE id = OLD.member_id;
+    END;
+    CREATE TRIGGER IF NOT EXISTS attendees_members_update AFTER UPDATE OF member_id ON attendees BEGIN
+        UPDATE members SET attendance_count = attendance_count - 1 WHERE id = OLD.member_id;
+        UPDATE members SET attendance_count = attendance_count + 1 WHERE id = NEW.member_id;
+    END;
+    ''',
+    # 12: durable work queue for --all crawls (see CrawlFrontier), so an
+    # interrupted crawl resumes instead of starting over
+    '''
+    CREATE TABLE IF NOT EXISTS crawl_frontier (
+        url TEXT PRIMARY KEY,
+        kind TEXT NOT NULL CHECK (kind IN ('event', 'page', 'profile')),
+        event_id INTEGER,
+        state TEXT NOT NULL DEFAULT 'pending' CHECK (state IN ('pending', 'in_flight', 'done', 'failed')),
+        attempts INTEGER NOT NULL DEFAULT 0,
+        last_error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE INDEX IF NOT EXISTS idx_crawl_frontier_kind_state ON crawl_frontier(kind, state);
+    ''',
+    # 13: profiles are upserted in bulk (upsert_profiles): content_hash lets a
+    # refresh skip unchanged profiles, and a profile keeps one row per field
+    '''
+    ALTER TABLE attendee_profiles ADD COLUMN content_hash TEXT;
+    DELETE FROM profile_fields WHERE id NOT IN (
+        SELECT MAX(id) FROM profile_fields GROUP BY profile_id, field_name);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_profile_fields_profile_name ON profile_fields(profile_id, field_name);
+    ''',
+]
+
+def _split_statements(script):
+    statement = ''
+    for line in script.splitlines(keepends=True):
+        statement += line
+        # complete_statement understands trigger bodies, so BEGIN ... END; stays whole
+        if sqlite3.complete_statement(statement):
+            if statement.strip():
+                yield statement
+            statement = ''
+    if statement.strip():
+        yield statement
+
+def migrate(conn):
+    """Create the base schema and apply pending migrations; returns the schema version"""
+    conn.executescript(SCHEMA)
+    while True:
+        # IMMEDIATE takes the write lock before reading the version, so two
+        # processes starting together cannot apply the same step twice
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = conn.execute('PRAGMA user_version').fetchone()[0]
+            if version >= len(MIGRATIONS):
+                conn.rollback()
+                return version
+            step = MIGRATIONS[version]
+            if callable(step):
+                step(conn)
+            else:
+                for statement in _split_statements(step):
+                    conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {version + 1}')
+            conn.commit()
+            logging.info(f"Applied schema migration {version + 1}")
+        except Exception:
+            conn.rollback()
+            raise
+
 # --- LOGGING ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
 
+# Only the member form and membership badge are read from a profile page, so
+# the parser can skip building nodes for the rest of the site chrome
+PROFILE_STRAINER = SoupStrainer(id=re.compile(r'memberProfile_MemberForm|membershipDetails'))
+
 def extract_profile_data_from_html(html):
-    soup = BeautifulSoup(html, 'html.parser')
+    """Parse a profile page (raw bytes or str) into a dict of profile fields"""
+    soup = BeautifulSoup(html, 'lxml', parse_only=PROFILE_STRAINER)
+    return extract_profile_data_from_soup(soup)
+
+def extract_profile_data_from_soup(soup):
     profile_data = {}
     form_repeater = soup.find('div', id=lambda x: x and 'memberProfile_MemberForm' in x)
     if form_repeater:
@@ -131,6 +548,351 @@ def extract_profile_data_from_html(html):
         profile_data['membership_level'] = membership_span.get_text(strip=True)
     return profile_data
 
+# --- ATTENDEE LIST PARSING ---
+REGISTERED_COUNT_RE = re.compile(r'Registered attendees\s*\((\d+)\)')
+# Start date of the "19 Jun 2025 6:00 PM - 9:00 PM" line in a list page's event info
+EVENT_DATE_RE = re.compile(r'\d{1,2} [A-Za-z]+ \d{4}')
+GUEST_COUNT_RE = re.compile(r'plus (\d+) guest')
+HEADER_DATE_LABELS = ('date', 'registered')
+HEADER_NAME_LABELS = ('name', 'attendee')
+
+def split_attendee_name(full_name):
+    """Split "Last, First" or "First Last" into (first_name, last_name)"""
+    if ',' in full_name:
+        last_name, _, first_name = full_name.partition(',')
+        last_name, first_name = last_name.strip(), first_name.strip()
+    elif ' ' in full_name:
+        first_name, _, last_name = full_name.partition(' ')
+    else:
+        first_name, last_name = full_name, ''
+    # Ensure we have valid names
+    if not first_name and not last_name:
+        first_name, last_name = full_name, ''
+    return first_name, last_name
+
+def attendee_record(date_cell, name_cell, href, base_url):
+    """Build an attendee dict from a row's stripped date/name text, or None for header/empty rows"""
+    name_lower = name_cell.lower()
+    # Skip header rows
+    if date_cell.lower() in HEADER_DATE_LABELS or name_lower in HEADER_NAME_LABELS:
+        return None
+    if not date_cell or not name_cell:
+        return None
+    guest_match = GUEST_COUNT_RE.search(name_lower)
+    full_name = name_cell.split('-', 1)[0].strip()
+    first_name, last_name = split_attendee_name(full_name)
+    return {
+        'date': date_cell,
+        'name': full_name,
+        'first_name': first_name,
+        'last_name': last_name,
+        'profile_url': urljoin(base_url, href) if href is not None else None,
+        'is_anonymous': 'anonymous user' in name_lower,
+        'guest_count': int(guest_match.group(1)) if guest_match else 0,
+        'raw_name': name_cell
+    }
+
+def _cell_text(cell):
+    # Same result as BeautifulSoup's get_text(strip=True)
+    return ''.join(text.strip() for text in cell.itertext())
+
+def parse_event_info(tree):
+    """(event name, event date) from the event info box of an attendee list page;
+    either is None when the page does not show it"""
+    def info_text(section):
+        texts = tree.xpath(f'//div[contains(@class, "{section}")]/div[@class="infoText"]')
+        return ' '.join(texts[0].text_content().split()) if texts else ''
+
+    date_match = EVENT_DATE_RE.search(info_text('eventRegistrationInfoEndDate'))
+    return info_text('eventRegistrationInfoEvent') or None, date_match.group(0) if date_match else None
+
+def parse_attendee_page(content, base_url):
+    """Parse an attendee list page in one lxml pass.
+
+    Returns a dict with the page's attendees (only rows of the #membersTable
+    attendee table are visited), its pagination links, the "Registered
+    attendees (N)" total and the event's name and date, or None if the page
+    has no attendee table.
+    """
+    if not content or not content.strip():
+        return None
+    tree = lxml.html.fromstring(content)
+    tables = tree.xpath('//table[@id="membersTable"]')
+    if not tables:
+        return None
+    attendees = []
+    for row in tables[0].iter('tr'):
+        cells = [cell for cell in row if cell.tag in ('td', 'th')]
+        if len(cells) < 2:
+            continue
+        link = next((a for a in cells[1].iter('a') if a.get('href') is not None), None)
+        record = attendee_record(_cell_text(cells[0]), _cell_text(cells[1]),
+                                 link.get('href') if link is not None else None, base_url)
+        if record:
+            attendees.append(record)
+
+    pagination_links = []
+    seen = set()
+    for a in tree.iter('a'):
+        href = a.get('href')
+        if href and 'elp=' in href:
+            full_url = urljoin(base_url, href)
+            if full_url not in seen:
+                seen.add(full_url)
+                pagination_links.append(full_url)
+
+    registered_count = None
+    for text in tree.xpath('//text()[contains(., "Registered attendees")]'):
+        match = REGISTERED_COUNT_RE.search(text)
+        if match:
+            registered_count = int(match.group(1))
+            break
+    event_name, event_date = parse_event_info(tree)
+    return {'attendees': attendees, 'pagination_links': pagination_links, 'registered_count': registered_count,
+            'event_name': event_name, 'event_date': event_date}
+
+def scan_attendee_tables(soup, base_url):
+    """Generic BeautifulSoup extractor that scans every table; used when a page
+    has no #membersTable for parse_attendee_page to target"""
+    attendees = []
+    for table in soup.find_all('table'):
+        for row in table.find_all('tr'):
+            cells = row.find_all(['td', 'th'])
+            if len(cells) >= 2:
+                # Check for profile link
+                link_tag = cells[1].find('a', href=True)
+                record = attendee_record(cells[0].get_text(strip=True), cells[1].get_text(strip=True),
+                                         link_tag['href'] if link_tag else None, base_url)
+                if record:
+                    attendees.append(record)
+    return attendees
+
+def find_pagination_links(soup, base_url):
+    """Distinct attendee list page links (elp=N) in document order"""
+    unique_links = []
+    seen = set()
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '')
+        if 'elp=' in href:
+            full_url = urljoin(base_url, href)
+            if full_url not in seen:
+                seen.add(full_url)
+                unique_links.append(full_url)
+    return unique_links
+
+def parse_attendee_listing(content, page_url):
+    """Parse an attendee list page into attendees, pagination links, live count
+    and event name and date.
+
+    Tries the lxml fast path first and falls back to scanning every table for
+    unfamiliar layouts. Module-level (and free of scraper state) so it can run
+    in a parse process.
+    """
+    page = parse_attendee_page(content, page_url)
+    if page is None:
+        soup = BeautifulSoup(content, 'html.parser')
+        heading = soup.find(string=REGISTERED_COUNT_RE)
+        event_name, event_date = parse_event_info(lxml.html.fromstring(content)) if content and content.strip() else (None, None)
+        page = {
+            'attendees': scan_attendee_tables(soup, page_url),
+            'pagination_links': find_pagination_links(soup, page_url),
+            'registered_count': int(REGISTERED_COUNT_RE.search(heading).group(1)) if heading else None,
+            'event_name': event_name,
+            'event_date': event_date,
+        }
+    return page
+
+def _init_parse_process():
+    # Ctrl+C reaches the whole process group; only the main process handles it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+# --- ROW NORMALIZATION ---
+# Run with the same rows before ATTENDEE_INSERT_SQL so the attendee's member exists.
+# The latest attendance written sets the member's name, as backfill_members does.
+MEMBER_INSERT_SQL = '''
+    INSERT INTO members (member_key, profile_url, full_name, first_name, last_name)
+    SELECT ?10, ?6, ?3, ?4, ?5 WHERE ?10 IS NOT NULL
+    ON CONFLICT (member_key) DO UPDATE SET
+        full_name = excluded.full_name, first_name = excluded.first_name, last_name = excluded.last_name
+'''
+ATTENDEE_INSERT_SQL = '''
+    INSERT OR IGNORE INTO attendees (event_id, event_date, full_name, first_name, last_name, profile_url, is_anonymous, guest_count, event_date_iso, member_id)
+    VALUES (?1, ?2, ?3, ?4, ?5, ?6, ?7, ?8, ?9, (SELECT id FROM members WHERE member_key = ?10))
+'''
+
+# Each move to in_flight counts as an attempt
+FRONTIER_MARK_SQL = '''
+    INSERT INTO crawl_frontier (url, kind, event_id, state, attempts, last_error)
+    VALUES (?1, ?2, ?3, ?4, ?4 = 'in_flight', ?5)
+    ON CONFLICT (url) DO UPDATE SET
+        state = excluded.state,
+        event_id = COALESCE(excluded.event_id, event_id),
+        attempts = attempts + excluded.attempts,
+        last_error = excluded.last_error,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# Profile keys stored in attendee_profiles columns; everything else goes to profile_fields
+PROFILE_COLUMN_KEYS = ['email', 'phone', 'company', 'title', 'job_title', 'bio', 'member since', 'member_since', 'city', 'location', 'skills', 'certifications']
+
+def attendee_row(attendee, event_id):
+    """Normalize a scraped attendee dict into an attendees row tuple, or None if invalid"""
+    # Check required fields
+    if not attendee.get('date') or not attendee.get('name'):
+        logging.error(f"Skipping attendee with missing required fields: {attendee}")
+        return None
+    
+    # Ensure all values are the correct type and not None
+    event_date = str(attendee['date']).strip()
+    full_name = str(attendee['name']).strip()
+    first_name = str(attendee.get('first_name', '')).strip() if attendee.get('first_name') else ''
+    last_name = str(attendee.get('last_name', '')).strip() if attendee.get('last_name') else ''
+    profile_url = str(attendee.get('profile_url', '')).strip() if attendee.get('profile_url') else None
+    is_anonymous = bool(attendee.get('is_anonymous', False))
+    guest_count = int(attendee.get('guest_count', 0)) if attendee.get('guest_count') else 0
+    
+    # Validate that we have valid data before inserting
+    if not event_date or not full_name:
+        logging.error(f"Skipping attendee with invalid data: {attendee}")
+        return None
+    
+    # Ensure we don't pass empty strings for a missing profile link
+    if profile_url == '':
+        profile_url = None
+    
+    return (int(event_id), event_date, full_name, first_name, last_name, profile_url, is_anonymous, guest_count,
+            parse_event_date(event_date), member_key(profile_url, full_name, is_anonymous))
+
+def _profile_value(profile_data, *keys):
+    for key in keys:
+        value = profile_data.get(key)
+        if value:
+            # Convert empty strings to None for SQLite
+            return str(value).strip() or None
+    return None
+
+def profile_row(profile_data):
+    """Normalize the column-backed profile values, in attendee_profiles column order"""
+    return (
+        _profile_value(profile_data, 'email'),
+        _profile_value(profile_data, 'phone'),
+        _profile_value(profile_data, 'company'),
+        _profile_value(profile_data, 'title', 'job_title'),
+        _profile_value(profile_data, 'bio'),
+        _profile_value(profile_data, 'member since', 'member_since'),
+        _profile_value(profile_data, 'city', 'location'),
+        _profile_value(profile_data, 'skills'),
+        _profile_value(profile_data, 'certifications'),
+    )
+
+def profile_field_rows(profile_data):
+    """Return (field_name, field_value) pairs for profile keys without a dedicated column"""
+    rows = []
+    for k, v in profile_data.items():
+        if k in PROFILE_COLUMN_KEYS:
+            continue
+        field_name = str(k).strip()
+        field_value = str(v).strip() if v else ''
+        if field_name and field_value:  # Only insert if both name and value are non-empty
+            rows.append((field_name, field_value))
+    return rows
+
+# attendee_id expression for profiles queued by DBWriter, which only know the
+# attendee's unique key; the attendee row is written earlier in the same batch
+ATTENDEE_ID_BY_KEY_SQL = '(SELECT id FROM attendees WHERE event_id = ? AND full_name = ? AND event_date = ?)'
+
+# Rows per multi-row upsert; keeps the bound parameters well under SQLite's limit
+PROFILE_UPSERT_CHUNK = 200
+
+PROFILE_UPSERT_SQL = '''
+    INSERT INTO attendee_profiles (attendee_id, profile_url, email, phone, company, job_title, bio, member_since,
+                                   location, skills, certifications, content_hash)
+    VALUES {rows}
+    ON CONFLICT (profile_url) DO UPDATE SET
+        email = excluded.email, phone = excluded.phone, company = excluded.company,
+        job_title = excluded.job_title, bio = excluded.bio, member_since = excluded.member_since,
+        location = excluded.location, skills = excluded.skills, certifications = excluded.certifications,
+        content_hash = excluded.content_hash, last_updated = CURRENT_TIMESTAMP
+    RETURNING id, profile_url
+'''
+
+def profile_content_hash(values, field_rows):
+    """Digest of everything stored for a profile, so a refresh can tell whether it changed"""
+    return hashlib.sha1(repr((tuple(values), sorted(field_rows))).encode('utf-8')).hexdigest()
+
+def upsert_profiles(conn, profiles, attendee_sql='?'):
+    """Insert or refresh a batch of parsed profiles inside the caller's transaction.
+
+    profiles holds (attendee_params, profile_url, values, field_rows) tuples:
+    values is a profile_row() tuple, field_rows the profile_field_rows() pairs,
+    and attendee_params the parameters of attendee_sql, the SQL expression for
+    attendee_id (kept from the first insert). A profile whose content hash
+    matches the stored one only has last_updated refreshed; new and changed
+    profiles are written with multi-row upserts and their profile_fields
+    replaced. Returns {profile_url: profile id}.
+    """
+    latest = {}
+    for attendee_params, profile_url, values, field_rows in profiles:
+        latest[profile_url] = (tuple(attendee_params), values, field_rows, profile_content_hash(values, field_rows))
+    urls = list(latest)
+    ids = {}
+    stored_hashes = {}
+    for start in range(0, len(urls), PROFILE_UPSERT_CHUNK):
+        chunk = urls[start:start + PROFILE_UPSERT_CHUNK]
+        rows = conn.execute(f'''
+            SELECT id, profile_url, content_hash FROM attendee_profiles WHERE profile_url IN ({', '.join('?' * len(chunk))})
+        ''', chunk)
+        for profile_id, profile_url, content_hash in rows:
+            ids[profile_url] = profile_id
+            stored_hashes[profile_url] = content_hash
+    changed = [url for url in urls if stored_hashes.get(url, '') != latest[url][3]]
+    # Unchanged profiles were still fetched just now, which is what --profile-ttl counts from
+    conn.executemany('UPDATE attendee_profiles SET last_updated = CURRENT_TIMESTAMP WHERE profile_url = ?',
+                     [(url,) for url in urls if stored_hashes.get(url, '') == latest[url][3]])
+
+    row_sql = f"({attendee_sql}, {', '.join('?' * 11)})"
+    for start in range(0, len(changed), PROFILE_UPSERT_CHUNK):
+        chunk = changed[start:start + PROFILE_UPSERT_CHUNK]
+        params = []
+        for url in chunk:
+            attendee_params, values, _, content_hash = latest[url]
+            params.extend(attendee_params + (url,) + tuple(values) + (content_hash,))
+        rows = conn.execute(PROFILE_UPSERT_SQL.format(rows=', '.join([row_sql] * len(chunk))), params)
+        ids.update((profile_url, profile_id) for profile_id, profile_url in rows)
+
+    conn.executemany('DELETE FROM profile_fields WHERE profile_id = ?', [(ids[url],) for url in changed if url in stored_hashes])
+    conn.executemany('''
+        INSERT INTO profile_fields (profile_id, field_name, field_value, field_type) VALUES (?, ?, ?, 'text')
+        ON CONFLICT (profile_id, field_name) DO UPDATE SET field_value = excluded.field_value
+    ''', [(ids[url], name, value) for url in changed for name, value in latest[url][2]])
+    return ids
+
+def retry_db_write(func, *args, **kwargs):
+    max_retries = 5
+    last_exception = None
+    
+    for attempt in range(max_retries):
+        try:
+            return func(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if 'database is locked' in str(e):
+                wait = 2 ** attempt
+                logging.warning(f"DB is locked, retrying in {wait}s (attempt {attempt+1}/{max_retries})...")
+                time.sleep(wait)
+                last_exception = e
+            else:
+                # Re-raise non-lock errors immediately
+                raise
+        except Exception as e:
+            # Re-raise non-OperationalError exceptions immediately
+            raise
+    
+    # If we get here, we've exhausted retries
+    if last_exception:
+        raise last_exception
+    else:
+        raise sqlite3.OperationalError("Max retries exceeded due to database lock.")
+
 class DatabaseManager:
     """Thread-safe database connection manager"""
     def __init__(self, db_file):
@@ -166,157 +928,592 @@ class DatabaseManager:
                     pass
             self._connections.clear()
 
+class DBWriter:
+    """Single writer thread that drains queued rows into batched transactions.
+
+    Scraping threads only enqueue normalized rows; all inserts happen here, in
+    one transaction per batch, so workers never contend for the SQLite write lock.
+    Rows are written in queue order, so a profile always lands after the
+    attendee row it references.
+    """
+    def __init__(self, db_manager, batch_size=500, flush_interval=0.25):
+        self.db_manager = db_manager
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='db-writer', daemon=True)
+        self._thread.start()
+
+    def put_event(self, event_id, event_name, event_url):
+        self._queue.put(('event', (event_id, event_name, event_url)))
+
+    def put_event_info(self, event_id, event_name, event_date):
+        """Queue the name and date shown on an event's attendee list; None keeps the stored value"""
+        self._queue.put(('event_info', (event_name, event_date, parse_event_date(event_date) or None, event_id)))
+
+    def put_event_total(self, event_id, total_attendees):
+        self._queue.put(('event_total', (total_attendees, event_id)))
+
+    def put_frontier(self, url, kind, state, event_id=None, error=None):
+        """Queue a crawl_frontier state change; it commits with (or after) everything queued before it"""
+        self._queue.put(('frontier', (url, kind, event_id, state, error)))
+
+    def put_attendee(self, attendee, event_id):
+        """Queue an attendee row; returns False if the attendee is invalid"""
+        row = attendee_row(attendee, event_id)
+        if row is None:
+            return False
+        self._queue.put(('attendee', row))
+        return True
+
+    def put_profile(self, attendee, event_id, profile_data):
+        """Queue a profile for an attendee queued earlier; returns False if it has no profile URL"""
+        profile_url = str(attendee.get('profile_url') or '').strip()
+        if not profile_url:
+            logging.error(f"Skipping profile insert because profile_url is empty: {attendee.get('name', 'unknown')}")
+            return False
+        attendee_key = (int(event_id), str(attendee['name']).strip(), str(attendee['date']).strip())
+        self._queue.put(('profile', (attendee_key, profile_url, profile_row(profile_data), profile_field_rows(profile_data))))
+        return True
+
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        done = threading.Event()
+        self._queue.put(('flush', done))
+        done.wait()
+
+    def close(self):
+        """Commit outstanding rows and stop the writer thread"""
+        self._queue.put(('stop', None))
+        self._thread.join()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                kind, item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._write(batch)
+                batch = []
+                continue
+            if kind in ('flush', 'stop'):
+                self._write(batch)
+                batch = []
+                if kind == 'stop':
+                    return
+                item.set()
+                continue
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append((kind, item))
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch):
+        if not batch:
+            return
+        try:
+            retry_db_write(self._write_rows, batch)
+        except Exception as e:
+            # One bad row rolls back the whole transaction: write the batch again
+            # one row at a time, in queue order, so only that row is lost
+            logging.warning(f"DB writer batch of {len(batch)} rows failed ({e}), writing row by row")
+            for kind, item in batch:
+                try:
+                    retry_db_write(self._write_rows, [(kind, item)])
+                except Exception as e:
+                    logging.error(f"DB writer dropped {kind} row {item!r}: {e}")
+
+    def _write_rows(self, batch):
+        """Write queued rows in one transaction"""
+        events = [item for kind, item in batch if kind == 'event']
+        attendees = [item for kind, item in batch if kind == 'attendee']
+        profiles = [item for kind, item in batch if kind == 'profile']
+        event_infos = [item for kind, item in batch if kind == 'event_info']
+        event_totals = [item for kind, item in batch if kind == 'event_total']
+        frontier = [item for kind, item in batch if kind == 'frontier']
+        conn = self.db_manager.get_connection()
+        with conn:
+            conn.executemany('INSERT OR IGNORE INTO events (id, event_name, event_url) VALUES (?, ?, ?)', events)
+            conn.executemany('''
+                UPDATE events SET event_name = COALESCE(?1, event_name), event_date = COALESCE(?2, event_date),
+                    event_date_iso = COALESCE(?3, event_date_iso) WHERE id = ?4
+            ''', event_infos)
+            conn.executemany(MEMBER_INSERT_SQL, attendees)
+            conn.executemany(ATTENDEE_INSERT_SQL, attendees)
+            upsert_profiles(conn, profiles, ATTENDEE_ID_BY_KEY_SQL)
+            conn.executemany('UPDATE events SET total_attendees = ? WHERE id = ?', event_totals)
+            # Last, so a URL is marked done in the same transaction as its rows
+            conn.executemany(FRONTIER_MARK_SQL, frontier)
+
+def retry_after_seconds(value):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), MAX_RETRY_AFTER)
+
+class RateLimiter:
+    """Thread-safe request scheduler shared by every fetch of a crawl.
+
+    Each acquire() reserves the next send slot, 1/rate seconds after the
+    previous one, so all threads together stay at the ceiling without bursts.
+    When the site pushes back, backoff() halves the rate (down to min_rate)
+    and holds every request until Retry-After has passed; each success()
+    then adds `step` back until the ceiling is reached again (AIMD). With
+    rate=None requests are unpaced, but server pauses are still honoured.
+    """
+    def __init__(self, rate=None, min_rate=None, step=None):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min_rate or (rate / 16 if rate else None)
+        self.step = step or (rate / 20 if rate else None)
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot, self._paused_until)
+                if self.rate:
+                    self._next_slot = slot + 1.0 / self.rate
+            if slot > now:
+                time.sleep(slot - now)
+            # A pause that began while we slept also applies to this request
+            with self._lock:
+                if time.monotonic() >= self._paused_until:
+                    return
+
+    def success(self):
+        if self.rate:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + self.step)
+
+    def backoff(self, retry_after=None):
+        with self._lock:
+            if self.rate:
+                self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after:
+                self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+
+class ProfileRegistry:
+    """Run-scoped, thread-safe record of profile URLs.
+
+    Each URL is fetched at most once per crawl: later requests for a URL that
+    was already loaded are skipped, and concurrent requests for a URL that is
+    being fetched wait for that single in-flight request instead of issuing
+    their own.
+    """
+    def __init__(self, known_urls=()):
+        self._lock = threading.Lock()
+        self._done = set(known_urls)
+        self._inflight = {}
+
+    def __len__(self):
+        with self._lock:
+            return len(self._done)
+
+    def is_known(self, url):
+        with self._lock:
+            return url in self._done
+
+    def add_known(self, urls):
+        with self._lock:
+            self._done.update(urls)
+
+    def fetch_once(self, url, loader):
+        """Return (profile_data, owner); owner is True only for the caller that ran loader(url).
+
+        loader returns None when the fetch failed; any other result, including
+        an empty dict for a page without profile fields, marks the URL done.
+        """
+        with self._lock:
+            if url in self._done:
+                return None, False
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = concurrent.futures.Future()
+                self._inflight[url] = future
+        if not owner:
+            return future.result(), False
+        profile_data = None
+        try:
+            profile_data = loader(url)
+        finally:
+            with self._lock:
+                del self._inflight[url]
+                # Failed fetches stay eligible so a later attendee row can retry them
+                if profile_data is not None:
+                    self._done.add(url)
+            future.set_result(profile_data)
+        return profile_data, True
+
+class CrawlFrontier:
+    """Durable work queue of an --all crawl, stored in crawl_frontier.
+
+    Event, pagination page and profile URLs move pending -> in_flight -> done
+    or failed. State changes are queued on the DBWriter behind the rows they
+    cover, so a URL is never recorded as done before its data is committed;
+    after a crash, anything not done is simply fetched again. Marks are only
+    recorded once start_crawl() sets `active`: a single-URL run leaves the
+    frontier alone, so it cannot pass for an enumerated --all crawl.
+    """
+    def __init__(self, db_manager, writer):
+        self.db_manager = db_manager
+        self.writer = writer
+        self.active = False
+
+    def _execute(self, sql, params=()):
+        self.writer.flush()
+        conn = self.db_manager.get_connection()
+        with conn:
+            return conn.execute(sql, params).rowcount
+
+    def reset(self):
+        """Forget the previous crawl"""
+        self._execute('DELETE FROM crawl_frontier')
+
+    def add(self, kind, urls):
+        self.writer.flush()
+        conn = self.db_manager.get_connection()
+        with conn:
+            conn.executemany('INSERT OR IGNORE INTO crawl_frontier (url, kind) VALUES (?, ?)', ((url, kind) for url in urls))
+
+    def requeue(self, states):
+        """Move URLs in the given states back to pending; returns how many moved"""
+        placeholders = ', '.join('?' * len(states))
+        return self._execute(f'''
+            UPDATE crawl_frontier SET state = 'pending', updated_at = CURRENT_TIMESTAMP WHERE state IN ({placeholders})
+        ''', tuple(states))
+
+    def urls(self, kind, state=None):
+        """URLs of a kind (optionally only in one state), in the order they were added"""
+        self.writer.flush()
+        conn = self.db_manager.get_connection()
+        sql = 'SELECT url FROM crawl_frontier WHERE kind = ?' + (' AND state = ?' if state else '') + ' ORDER BY rowid'
+        return [row['url'] for row in conn.execute(sql, (kind, state) if state else (kind,))]
+
+    def done(self, urls):
+        """The subset of urls already done"""
+        urls = list(urls)
+        if not urls:
+            return set()
+        conn = self.db_manager.get_connection()
+        placeholders = ', '.join('?' * len(urls))
+        rows = conn.execute(f"SELECT url FROM crawl_frontier WHERE state = 'done' AND url IN ({placeholders})", urls)
+        return {row['url'] for row in rows}
+
+    def counts(self):
+        """{(kind, state): count} for a progress summary"""
+        self.writer.flush()
+        conn = self.db_manager.get_connection()
+        rows = conn.execute('SELECT kind, state, COUNT(*) AS n FROM crawl_frontier GROUP BY kind, state')
+        return {(row['kind'], row['state']): row['n'] for row in rows}
+
+    def start(self, url, kind, event_id=None):
+        if self.active:
+            self.writer.put_frontier(url, kind, 'in_flight', event_id)
+
+    def finish(self, url, kind, event_id=None, error=None):
+        """Mark url done, or failed with `error`; queue it after the url's own rows"""
+        if self.active:
+            self.writer.put_frontier(url, kind, 'failed' if error else 'done', event_id, error)
+
+class ResponseCache:
+    """On-disk HTTP response cache keyed by URL.
+
+    Bodies are stored gzip-compressed next to a small JSON file holding the
+    ETag / Last-Modified validators, which fetch() sends back as conditional
+    request headers. In offline mode only cached responses are served and the
+    network is never touched.
+    """
+    def __init__(self, cache_dir, offline=False):
+        self.cache_dir = cache_dir
+        self.offline = offline
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, url, suffix):
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + suffix)
+
+    def load(self, url):
+        """Return (meta, body) for a cached URL, or None"""
+        try:
+            with open(self._path(url, '.json'), encoding='utf-8') as f:
+                meta = json.load(f)
+            with gzip.open(self._path(url, '.gz'), 'rb') as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, meta):
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url, response):
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        body_path = self._path(url, '.gz')
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # Write to temp files and rename so concurrent readers never see partial entries
+        tmp_suffix = f'.{threading.get_ident()}.tmp'
+        with gzip.open(body_path + tmp_suffix, 'wb') as f:
+            f.write(response.content)
+        os.replace(body_path + tmp_suffix, body_path)
+        meta_path = self._path(url, '.json')
+        with open(meta_path + tmp_suffix, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(meta_path + tmp_suffix, meta_path)
+
+class SessionManager:
+    """Thread-safe HTTP session manager (one requests.Session per thread)"""
+    def __init__(self, pool_size=10):
+        self.pool_size = pool_size
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    def _create_session(self):
+        session = requests.Session()
+        session.headers.update({'User-Agent': USER_AGENT})
+        # No adapter-level retries: DFWTRNDBScraper.fetch retries, so that every
+        # attempt goes through the crawl's rate limiter
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def get_session(self, thread_id=None):
+        """Get an HTTP session for the current thread"""
+        if thread_id is None:
+            thread_id = threading.get_ident()
+            
+        with self._lock:
+            if thread_id not in self._sessions:
+                self._sessions[thread_id] = self._create_session()
+                
+        return self._sessions[thread_id]
+
+    def close_all(self):
+        """Close all HTTP sessions"""
+        with self._lock:
+            for session in self._sessions.values():
+                try:
+                    session.close()
+                except:
+                    pass
+            self._sessions.clear()
+
 class DFWTRNDBScraper:
-    def __init__(self, db_file=DB_FILE, delay=1.0):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
-        self.delay = delay
+    def __init__(self, db_file=DB_FILE, delay=1.0, pool_size=10, incremental=False, profile_ttl_days=30, cache=None,
+                 profile_workers=4, event_workers=1, page_workers=4, rate=None, retries=3, parse_procs=0):
+        self.session_manager = SessionManager(pool_size=pool_size)
+        self.cache = cache
+        # One requests/second ceiling for the whole crawl (default 1/delay),
+        # shared by every worker thread and engine
+        self.rate_limiter = RateLimiter(rate or (1.0 / delay if delay > 0 else None))
+        self.retries = retries
+        self.incremental = incremental
+        self.profile_ttl_days = profile_ttl_days
+        # Pagination and profile fetches share one long-lived pool (so per-thread
+        # sessions are reused); the *_workers settings cap what one event has in
+        # flight, and an event's page and profile fetches overlap
+        self.profile_workers = max(1, profile_workers)
+        self.page_workers = max(1, page_workers)
+        self.fetch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=(self.profile_workers + self.page_workers) * max(1, event_workers), thread_name_prefix='fetch')
+        # Optional pool of parser processes: fetch threads hand it response bodies
+        # and wait without holding the GIL, so parsing is not capped at one core
+        # and its parallelism is sized apart from network concurrency
+        self.parse_executor = None
+        if parse_procs > 0:
+            self.parse_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=parse_procs, mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_parse_process)
         self.db_manager = DatabaseManager(db_file)
         self.ensure_schema()
+        self.profile_registry = ProfileRegistry(self.known_profile_urls())
+        self.writer = DBWriter(self.db_manager)
+        self.frontier = CrawlFrontier(self.db_manager, self.writer)
+        # Set by start_crawl: pages and profiles the frontier has as done are skipped
+        self.resuming = False
+
+    def close(self):
+        """Stop worker threads, commit queued rows and release sessions and connections"""
+        self.fetch_executor.shutdown(wait=True)
+        if self.parse_executor is not None:
+            self.parse_executor.shutdown(wait=True)
+        self.session_manager.close_all()
+        # Commit whatever the writer thread still has queued
+        self.writer.close()
+        # Always clean up database connections
+        try:
+            self.db_manager.close_all()
+            logging.info("Database connections closed.")
+        except Exception as e:
+            logging.error(f"Error closing database connections: {e}")
+
+    @property
+    def session(self):
+        """HTTP session owned by the calling thread"""
+        return self.session_manager.get_session()
 
     def ensure_schema(self):
-        conn = self.db_manager.get_connection()
-        with conn:
-            conn.executescript(SCHEMA)
+        return migrate(self.db_manager.get_connection())
+
+    def fetch(self, url):
+        """Fetch a URL and return the raw response body, or None on error.
+
+        Every attempt waits for a slot from the shared rate limiter. 429/503
+        responses slow the whole crawl down (honouring Retry-After); they, other
+        5xx responses and network errors are retried up to `retries` times with
+        jittered exponential backoff.
+        """
+        cached = self.cache.load(url) if self.cache else None
+        if self.cache and self.cache.offline:
+            if cached is None:
+                logging.warning(f"Not in cache (offline mode): {url}")
+                return None
+            return cached[1]
+        headers = self.cache.conditional_headers(cached[0]) if cached else None
+        error = None
+        for attempt in range(self.retries + 1):
+            if attempt:
+                wait = random.uniform(0, RETRY_BACKOFF * 2 ** (attempt - 1))
+                logging.warning(f"Retrying {url} in {wait:.1f}s after {error} (attempt {attempt + 1}/{self.retries + 1})")
+                time.sleep(wait)
+            self.rate_limiter.acquire()
+            try:
+                logging.info(f"Fetching: {url}")
+                response = self.session.get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+                continue
+            except requests.RequestException as e:
+                logging.error(f"Error fetching {url}: {e}")
+                return None
+            if response.status_code in THROTTLE_STATUSES:
+                self.rate_limiter.backoff(retry_after_seconds(response.headers.get('Retry-After')))
+                error = f"HTTP {response.status_code}"
+                continue
+            if response.status_code >= 500:
+                error = f"HTTP {response.status_code}"
+                continue
+            self.rate_limiter.success()
+            if response.status_code == 304 and cached:
+                logging.info(f"Not modified, using cached copy: {url}")
+                return cached[1]
+            try:
+                response.raise_for_status()
+            except requests.RequestException as e:
+                logging.error(f"Error fetching {url}: {e}")
+                return None
+            if self.cache:
+                self.cache.store(url, response)
+            return response.content
+        logging.error(f"Error fetching {url}: {error} (gave up after {self.retries + 1} attempts)")
+        return None
 
     def get_page(self, url):
-        try:
-            logging.info(f"Fetching: {url}")
-            response = self.session.get(url)
-            response.raise_for_status()
-            return BeautifulSoup(response.content, 'html.parser')
-        except requests.RequestException as e:
-            logging.error(f"Error fetching {url}: {e}")
+        content = self.fetch(url)
+        if content is None:
             return None
+        return BeautifulSoup(content, 'html.parser')
 
     def get_pagination_links(self, soup, base_url):
-        pagination_links = []
-        links = soup.find_all('a', href=True)
-        for link in links:
-            href = link.get('href', '')
-            if 'elp=' in href:
-                full_url = urljoin(base_url, href)
-                pagination_links.append(full_url)
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_links = []
-        for link in pagination_links:
-            if link not in seen:
-                seen.add(link)
-                unique_links.append(link)
-        return unique_links
+        return find_pagination_links(soup, base_url)
 
     def extract_attendees_from_page(self, soup, base_url):
-        attendees = []
-        tables = soup.find_all('table')
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    date_cell = cells[0].get_text(strip=True)
-                    name_cell = cells[1].get_text(strip=True)
-                    # Skip header rows
-                    if date_cell.lower() in ['date', 'registered'] or name_cell.lower() in ['name', 'attendee']:
-                        continue
-                    if not date_cell or not name_cell:
-                        continue
-                    # Check for profile link
-                    link_tag = cells[1].find('a', href=True)
-                    profile_url = urljoin(base_url, link_tag['href']) if link_tag else None
-                    is_anonymous = 'anonymous user' in name_cell.lower()
-                    guest_count = 0
-                    m = re.search(r'plus (\d+) guest', name_cell.lower())
-                    if m:
-                        guest_count = int(m.group(1))
-                    # Parse name
-                    full_name = name_cell.split('-')[0].strip()
-                    if ',' in full_name:
-                        parts = [x.strip() for x in full_name.split(',', 1)]
-                        if len(parts) >= 2:
-                            last_name, first_name = parts[0], parts[1]
-                        else:
-                            last_name, first_name = parts[0], ''
-                    elif ' ' in full_name:
-                        parts = full_name.split(' ', 1)
-                        if len(parts) >= 2:
-                            first_name, last_name = parts[0], parts[1]
-                        else:
-                            first_name, last_name = parts[0], ''
-                    else:
-                        first_name = full_name
-                        last_name = ''
-                    
-                    # Ensure we have valid names
-                    if not first_name and not last_name:
-                        first_name = full_name
-                        last_name = ''
-                    
-                    attendees.append({
-                        'date': date_cell,
-                        'name': full_name,
-                        'first_name': first_name,
-                        'last_name': last_name,
-                        'profile_url': profile_url,
-                        'is_anonymous': is_anonymous,
-                        'guest_count': guest_count,
-                        'raw_name': name_cell
-                    })
-        return attendees
-
-    def extract_all_attendees(self, event_url):
-        soup = self.get_page(event_url)
-        if not soup:
-            return []
-        pagination_links = self.get_pagination_links(soup, event_url)
-        if event_url not in pagination_links:
-            pagination_links.insert(0, event_url)
-        all_attendees = []
-        for i, page_url in enumerate(pagination_links):
-            logging.info(f"Scraping attendee page {i+1}/{len(pagination_links)}: {page_url}")
-            page_soup = self.get_page(page_url)
-            if not page_soup:
-                continue
-            attendees = self.extract_attendees_from_page(page_soup, page_url)
-            logging.info(f"  Found {len(attendees)} attendees on this page.")
-            all_attendees.extend(attendees)
-            if i < len(pagination_links) - 1:
-                time.sleep(self.delay)
-        return all_attendees
+        return scan_attendee_tables(soup, base_url)
+
+    def parse(self, parser, *args):
+        """Run a module-level parser over downloaded bytes: in the parse process
+        pool when --parse-procs is set, otherwise in the calling thread"""
+        if self.parse_executor is None:
+            return parser(*args)
+        return self.parse_executor.submit(parser, *args).result()
+
+    def load_attendee_page(self, page_url):
+        """Fetch and parse an attendee list page into attendees, pagination links and live count"""
+        content = self.fetch(page_url)
+        if content is None:
+            return None
+        return self.parse(parse_attendee_listing, content, page_url)
+
+    def _ordered_map(self, func, items, limit):
+        """Run func over items on the fetch pool with at most `limit` in flight,
+        yielding results in input order"""
+        window = collections.deque()
+        for item in items:
+            if len(window) >= limit:
+                yield window.popleft().result()
+            window.append(self.fetch_executor.submit(func, item))
+        while window:
+            yield window.popleft().result()
+
+    def fetch_attendee_page(self, page_url, event_id=None):
+        """Fetch and parse one attendee list page (runs on the fetch pool); None if the fetch failed"""
+        self.frontier.start(page_url, 'page', event_id)
+        page = self.load_attendee_page(page_url)
+        if not page:
+            return None
+        logging.info(f"  Found {len(page['attendees'])} attendees on {page_url}")
+        return page['attendees']
+
+    def iter_attendee_pages(self, event_url, first_page, event_id=None, skip=()):
+        """Yield (page_url, attendees) for an event's list pages in page order,
+        starting with the already-loaded first page; attendees is None for a
+        page that could not be fetched. Pages in `skip` are not fetched.
+
+        At most page_workers pages are fetched ahead of the consumer, so a
+        caller that handles each page before asking for the next one holds a
+        bounded number of pages however large the event is.
+        """
+        yield event_url, first_page['attendees']
+        # Every page URL is known up front: fetch the rest concurrently while the
+        # already-parsed first page is processed, and reassemble in page order
+        other_pages = [url for url in first_page['pagination_links'] if url != event_url and url not in skip]
+        logging.info(f"Scraping {len(other_pages) + 1} attendee pages for {event_url}")
+        fetch = functools.partial(self.fetch_attendee_page, event_id=event_id)
+        yield from zip(other_pages, self._ordered_map(fetch, other_pages, self.page_workers))
+
+    def extract_all_attendees(self, event_url, first_page=None):
+        """Yield an event's attendees page by page, as each list page is parsed;
+        first_page is an already-loaded first page"""
+        first_page = first_page or self.load_attendee_page(event_url)
+        if not first_page:
+            return
+        for _, attendees in self.iter_attendee_pages(event_url, first_page):
+            yield from attendees or ()
 
     def extract_profile_data(self, profile_url):
-        soup = self.get_page(profile_url)
-        if not soup:
-            return {}
-        return extract_profile_data_from_html(str(soup))
+        """Fetch and parse a profile page; None if the fetch failed, {} for a page without profile fields"""
+        content = self.fetch(profile_url)
+        if content is None:
+            return None
+        return self.parse(extract_profile_data_from_html, content)
 
     def _retry_db_write(self, func, *args, **kwargs):
-        max_retries = 5
-        last_exception = None
-        
-        for attempt in range(max_retries):
-            try:
-                return func(*args, **kwargs)
-            except sqlite3.OperationalError as e:
-                if 'database is locked' in str(e):
-                    wait = 2 ** attempt
-                    logging.warning(f"DB is locked, retrying in {wait}s (attempt {attempt+1}/{max_retries})...")
-                    time.sleep(wait)
-                    last_exception = e
-                else:
-                    # Re-raise non-lock errors immediately
-                    raise
-            except Exception as e:
-                # Re-raise non-OperationalError exceptions immediately
-                raise
-        
-        # If we get here, we've exhausted retries
-        if last_exception:
-            raise last_exception
-        else:
-            raise sqlite3.OperationalError("Max retries exceeded due to database lock.")
+        return retry_db_write(func, *args, **kwargs)
 
     def upsert_attendee(self, attendee, event_id):
         def do_write():
@@ -325,45 +1522,15 @@ class DFWTRNDBScraper:
             attendee_id = None  # Initialize to avoid scope issues
             
             try:
-                # Check required fields
-                if not attendee.get('date') or not attendee.get('name'):
-                    logging.error(f"Skipping attendee with missing required fields: {attendee}")
+                row = attendee_row(attendee, event_id)
+                if row is None:
                     return None
-                
-                # Ensure all values are the correct type and not None
-                event_id_int = int(event_id)  # Use different variable name
-                event_date = str(attendee['date']).strip()
-                full_name = str(attendee['name']).strip()
-                first_name = str(attendee.get('first_name', '')).strip() if attendee.get('first_name') else ''
-                last_name = str(attendee.get('last_name', '')).strip() if attendee.get('last_name') else ''
-                profile_url = str(attendee.get('profile_url', '')).strip() if attendee.get('profile_url') else None
-                is_anonymous = bool(attendee.get('is_anonymous', False))
-                guest_count = int(attendee.get('guest_count', 0)) if attendee.get('guest_count') else 0
-                
-                # Validate that we have valid data before inserting
-                if not event_date or not full_name:
-                    logging.error(f"Skipping attendee with invalid data: {attendee}")
-                    return None
-                
-                # Ensure we don't pass None values to SQLite
-                if profile_url == '':
-                    profile_url = None
+                event_id_int, event_date, full_name = row[0], row[1], row[2]
                 
                 conn = self.db_manager.get_connection()
                 with conn:
-                    cur = conn.execute('''
-                        INSERT OR IGNORE INTO attendees (event_id, event_date, full_name, first_name, last_name, profile_url, is_anonymous, guest_count)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        event_id_int,
-                        event_date,
-                        full_name,
-                        first_name,
-                        last_name,
-                        profile_url,
-                        is_anonymous,
-                        guest_count
-                    ))
+                    conn.execute(MEMBER_INSERT_SQL, row)
+                    cur = conn.execute(ATTENDEE_INSERT_SQL, row)
                     if cur.lastrowid:
                         attendee_id = cur.lastrowid
                     else:
@@ -399,9 +1566,8 @@ class DFWTRNDBScraper:
             return None
 
     def upsert_profile(self, attendee_id, profile_url, profile_data):
+        """Insert or refresh one profile (see upsert_profiles); returns its id"""
         def do_write():
-            profile_id = None  # Initialize to avoid scope issues
-            
             try:
                 if attendee_id is None:
                     logging.error(f"Skipping profile insert because attendee_id is None: profile_url={profile_url}")
@@ -416,166 +1582,211 @@ class DFWTRNDBScraper:
                     logging.error(f"Skipping profile insert because profile_url is empty: attendee_id={attendee_id}")
                     return None
                 
-                # Convert profile data values to strings, handling None values properly
-                email = str(profile_data.get('email', '')).strip() if profile_data.get('email') else None
-                phone = str(profile_data.get('phone', '')).strip() if profile_data.get('phone') else None
-                company = str(profile_data.get('company', '')).strip() if profile_data.get('company') else None
-                job_title = str(profile_data.get('title') or profile_data.get('job_title', '')).strip() if (profile_data.get('title') or profile_data.get('job_title')) else None
-                bio = str(profile_data.get('bio', '')).strip() if profile_data.get('bio') else None
-                member_since = str(profile_data.get('member since') or profile_data.get('member_since', '')).strip() if (profile_data.get('member since') or profile_data.get('member_since')) else None
-                location = str(profile_data.get('city') or profile_data.get('location', '')).strip() if (profile_data.get('city') or profile_data.get('location')) else None
-                skills = str(profile_data.get('skills', '')).strip() if profile_data.get('skills') else None
-                certifications = str(profile_data.get('certifications', '')).strip() if profile_data.get('certifications') else None
-                
-                # Convert empty strings to None for SQLite
-                if email == '':
-                    email = None
-                if phone == '':
-                    phone = None
-                if company == '':
-                    company = None
-                if job_title == '':
-                    job_title = None
-                if bio == '':
-                    bio = None
-                if member_since == '':
-                    member_since = None
-                if location == '':
-                    location = None
-                if skills == '':
-                    skills = None
-                if certifications == '':
-                    certifications = None
-                
                 conn = self.db_manager.get_connection()
                 with conn:
-                    cur = conn.execute('''
-                        INSERT OR IGNORE INTO attendee_profiles (attendee_id, profile_url, email, phone, company, job_title, bio, member_since, location, skills, certifications)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        attendee_id_int,
-                        profile_url_str,
-                        email,
-                        phone,
-                        company,
-                        job_title,
-                        bio,
-                        member_since,
-                        location,
-                        skills,
-                        certifications
-                    ))
-                    if cur.lastrowid:
-                        profile_id = cur.lastrowid
-                    else:
-                        # Try to find existing record
-                        row = conn.execute('''
-                            SELECT id FROM attendee_profiles WHERE profile_url=?
-                        ''', (profile_url_str,)).fetchone()
-                        profile_id = row['id'] if row else None
-                    
-                    # Insert dynamic fields only if we have a valid profile_id
-                    if profile_id:
-                        for k, v in profile_data.items():
-                            if k in ['email', 'phone', 'company', 'title', 'job_title', 'bio', 'member since', 'member_since', 'city', 'location', 'skills', 'certifications']:
-                                continue
-                            try:
-                                field_name = str(k).strip()
-                                field_value = str(v).strip() if v else ''
-                                if field_name and field_value:  # Only insert if both name and value are non-empty
-                                    conn.execute('''
-                                        INSERT OR IGNORE INTO profile_fields (profile_id, field_name, field_value, field_type)
-                                        VALUES (?, ?, ?, ?)
-                                    ''', (profile_id, field_name, field_value, 'text'))
-                            except Exception as field_error:
-                                logging.warning(f"Failed to insert profile field {k}: {field_error}")
-                    
-                    return profile_id
-            except sqlite3.IntegrityError as e:
-                if 'UNIQUE constraint failed' in str(e):
-                    logging.warning(f"Duplicate profile skipped: {profile_url}")
-                    # Try to get existing profile_id
-                    try:
-                        row = conn.execute('''
-                            SELECT id FROM attendee_profiles WHERE profile_url=?
-                        ''', (profile_url_str,)).fetchone()
-                        return row['id'] if row else None
-                    except Exception as lookup_error:
-                        logging.error(f"Error looking up existing profile: {lookup_error}")
-                        return None
-                else:
-                    logging.error(f"Integrity error for profile: attendee_id={attendee_id}, profile_url={profile_url}: {e}")
-                    return None
+                    profile_ids = upsert_profiles(conn, [((attendee_id_int,), profile_url_str, profile_row(profile_data),
+                                                          profile_field_rows(profile_data))])
+                return profile_ids.get(profile_url_str)
             except Exception as e:
                 logging.error(f"DB insert error for profile: attendee_id={attendee_id}, profile_url={profile_url}: {e}")
                 return None
         
         return self._retry_db_write(do_write)
 
-    def upsert_event(self, event_id, event_name, event_date, event_url, total_attendees):
-        def do_write():
-            conn = self.db_manager.get_connection()
-            with conn:
-                conn.execute('''
-                    INSERT OR IGNORE INTO events (id, event_name, event_date, event_url, total_attendees)
-                    VALUES (?, ?, ?, ?, ?)
-                ''', (event_id, event_name, event_date, event_url, total_attendees))
-        return self._retry_db_write(do_write)
+    def event_is_unchanged(self, event_id, live_count):
+        """In incremental mode, True if the stored attendee total matches the live count"""
+        if not self.incremental or live_count is None:
+            return False
+        conn = self.db_manager.get_connection()
+        row = conn.execute('SELECT total_attendees FROM events WHERE id = ?', (event_id,)).fetchone()
+        return row is not None and row['total_attendees'] == live_count
 
-    def scrape_and_load(self, event_url):
+    def known_profile_urls(self):
+        """Profile URLs that need no fetch this run: in incremental mode, those
+        stored within the profile TTL; otherwise none, so each is refreshed once"""
+        if not self.incremental:
+            return []
+        conn = self.db_manager.get_connection()
+        rows = conn.execute('''
+            SELECT profile_url FROM attendee_profiles WHERE last_updated >= datetime('now', ?)
+        ''', (f'-{self.profile_ttl_days} days',)).fetchall()
+        return [row['profile_url'] for row in rows]
+
+    def fetch_profile_once(self, profile_url, event_id=None):
+        """Fetch and parse a profile unless this run already has (or is fetching) it"""
+        def load(url):
+            self.frontier.start(url, 'profile', event_id)
+            return self.extract_profile_data(url)
+        return self.profile_registry.fetch_once(profile_url, load)
+
+    def store_profile(self, attendee, event_id, profile_data):
+        """Queue a fetched profile and record the outcome in the frontier; True if
+        stored, False if the fetch failed, None if the profile has no fields"""
+        if profile_data is None:
+            self.frontier.finish(attendee['profile_url'], 'profile', event_id, error='fetch failed')
+            return False
+        if not profile_data:
+            # A private or empty profile: nothing to store, but nothing to retry either
+            self.frontier.finish(attendee['profile_url'], 'profile', event_id)
+            return None
+        stored = self.writer.put_profile(attendee, event_id, profile_data)
+        self.frontier.finish(attendee['profile_url'], 'profile', event_id,
+                             error=None if stored else 'profile not stored')
+        return stored
+
+    def stored_profile_attendees(self, event_id):
+        """Attendees of an event already in the database that have a profile link
+        (for resumed events whose list pages are not fetched again)"""
+        self.writer.flush()
+        conn = self.db_manager.get_connection()
+        rows = conn.execute('''
+            SELECT full_name, event_date, profile_url FROM attendees WHERE event_id = ? AND profile_url IS NOT NULL
+        ''', (event_id,)).fetchall()
+        return [{'name': row['full_name'], 'date': row['event_date'], 'profile_url': row['profile_url']} for row in rows]
+
+    def start_crawl(self, events_url="https://www.dfwtrn.org/Events", resume=False, retry_failed=False, limit=None):
+        """Prepare the crawl frontier and return the event URLs left to scrape.
+
+        A fresh crawl clears the frontier and enumerates the events again.
+        resume continues an interrupted crawl: work left in flight is requeued,
+        and pages and profiles already done are not fetched again. retry_failed
+        also requeues everything that failed, so only that work is re-run.
+        """
+        self.resuming = resume or retry_failed
+        self.frontier.active = True
+        if self.resuming:
+            requeued = self.frontier.requeue(('in_flight', 'failed') if retry_failed else ('in_flight',))
+            self.profile_registry.add_known(self.frontier.urls('profile', 'done'))
+            logging.info(f"Resuming crawl: {requeued} URLs requeued")
+        else:
+            self.frontier.reset()
+        if not self.frontier.urls('event'):
+            event_links = self.extract_all_event_links(events_url)
+            if limit is not None:
+                event_links = event_links[:limit]
+            self.frontier.add('event', event_links)
+        return self.frontier.urls('event', 'pending')
+
+    def ensure_event(self, event_url):
+        """Queue the event record for an attendee URL and return its id"""
         # Extract event_id from URL and ensure it's an integer
         parsed_url = urlparse(event_url)
         event_id_match = re.search(r'event-(\d+)', parsed_url.path)
         if not event_id_match:
             logging.error(f"Could not extract event ID from URL: {event_url}")
-            return
+            return None
         
         event_id = int(event_id_match.group(1))
         logging.info(f"Processing event {event_id}")
         
-        # Get or create event record
-        try:
-            conn = self.db_manager.get_connection()
-            with conn:
-                event = conn.execute('SELECT * FROM events WHERE id = ?', (event_id,)).fetchone()
-                if not event:
-                    # Try to get event name from the page
-                    event_name = f"Event {event_id}"
-                    conn.execute('INSERT INTO events (id, event_name, event_url) VALUES (?, ?, ?)', 
-                                (event_id, event_name, event_url))
-                    logging.info(f"Created new event record: {event_name}")
-        except Exception as e:
-            logging.error(f"Error creating event record for event {event_id}: {e}")
-            return
-        
-        # Scrape attendees using the proper method
-        attendees = self.extract_all_attendees(event_url)
-        attendees_scraped = 0
-        profiles_scraped = 0
+        # Placeholder name; an existing event record is left untouched
+        self.writer.put_event(event_id, f"Event {event_id}", event_url)
+        return event_id
+
+    def scrape_and_load(self, event_url):
+        event_id = self.ensure_event(event_url)
+        if event_id is None:
+            return 0, 0
         
-        for attendee in attendees:
-            try:
-                # Insert attendee
-                attendee_id = self.upsert_attendee(attendee, event_id)
-                if attendee_id is not None:
-                    attendees_scraped += 1
-                    
-                    # Extract profile data if profile link exists
-                    if attendee.get('profile_url'):
-                        profile_data = self.extract_profile_data(attendee['profile_url'])
-                        if profile_data:
-                            profile_id = self.upsert_profile(attendee_id, attendee['profile_url'], profile_data)
-                            if profile_id is not None:
-                                profiles_scraped += 1
-                
-            except Exception as e:
-                attendee_name = attendee.get('name', 'unknown') if attendee else 'unknown'
-                logging.error(f"Error processing attendee {attendee_name}: {e}")
-                continue
+        self.frontier.start(event_url, 'event', event_id)
+        first_page = self.load_attendee_page(event_url)
+        if not first_page:
+            self.frontier.finish(event_url, 'event', event_id, error='attendee list fetch failed')
+            return 0, 0
+        self.writer.put_event_info(event_id, first_page['event_name'], first_page['event_date'])
+        live_count = first_page['registered_count']
+        if self.event_is_unchanged(event_id, live_count):
+            logging.info(f"Event {event_id} unchanged ({live_count} attendees), skipping")
+            self.frontier.finish(event_url, 'event', event_id)
+            return 0, 0
         
+        # A resumed event only fetches the list pages that were not done
+        skip = self.frontier.done(first_page['pagination_links']) - {event_url} if self.resuming else set()
+        attendees_seen = 0
+        attendees_scraped = 0
+        failures = 0
+
+        def profile_attendees():
+            """Queue each list page's attendees as soon as it is parsed and yield the
+            ones whose profiles still need fetching; nothing is kept for the whole event"""
+            nonlocal attendees_seen, attendees_scraped, failures
+            for page_url, page_attendees in self.iter_attendee_pages(event_url, first_page, event_id, skip):
+                if page_attendees is None:
+                    self.frontier.finish(page_url, 'page', event_id, error='fetch failed')
+                    failures += 1
+                    continue
+                attendees_seen += len(page_attendees)
+                new_profiles = []
+                for attendee in page_attendees:
+                    try:
+                        # Queue attendee for the writer thread
+                        if self.writer.put_attendee(attendee, event_id):
+                            attendees_scraped += 1
+                            if attendee.get('profile_url') and not self.profile_registry.is_known(attendee['profile_url']):
+                                new_profiles.append(attendee)
+                    except Exception as e:
+                        logging.error(f"Error processing attendee {attendee.get('name', 'unknown')}: {e}")
+                # Queued behind the page's attendee rows, so it is only done once they commit
+                if page_url != event_url:
+                    self.frontier.finish(page_url, 'page', event_id)
+                yield from new_profiles
+            if skip:
+                yield from (attendee for attendee in self.stored_profile_attendees(event_id)
+                            if not self.profile_registry.is_known(attendee['profile_url']))
+
+        # Profile fetches start while later list pages are still being fetched
+        profiles_scraped, profile_failures = self.load_profiles(event_id, profile_attendees())
+        if shutdown_requested:
+            # Left in flight; a --resume run picks the event up again
+            logging.info(f"Event {event_id} interrupted: {attendees_scraped} attendees, {profiles_scraped} profiles")
+            return attendees_scraped, profiles_scraped
+        # The total is what --incremental compares against, so only an event whose
+        # pages all loaded records it; without a live count, only a full pass over
+        # the pages knows the total
+        if not failures and (live_count is not None or not skip):
+            self.writer.put_event_total(event_id, live_count if live_count is not None else attendees_seen)
+        failures += profile_failures
+        self.frontier.finish(event_url, 'event', event_id,
+                             error=f"{failures} pages or profiles failed" if failures else None)
         logging.info(f"Event {event_id} complete: {attendees_scraped} attendees, {profiles_scraped} profiles")
         return attendees_scraped, profiles_scraped
 
+    def load_profiles(self, event_id, attendees):
+        """Fetch profiles for an event's attendees, at most profile_workers at a time,
+        and queue each result for the writer as soon as it arrives; returns
+        (profiles stored, profiles failed). attendees may be a generator: it is
+        consumed only as fetch slots free up. Stops submitting on shutdown."""
+        profiles_scraped = 0
+        profile_failures = 0
+        pending = {}
+
+        def collect(done):
+            nonlocal profiles_scraped, profile_failures
+            for future in done:
+                attendee = pending.pop(future)
+                try:
+                    profile_data, owner = future.result()
+                    if not owner:
+                        continue
+                    stored = self.store_profile(attendee, event_id, profile_data)
+                    if stored:
+                        profiles_scraped += 1
+                    elif stored is False:
+                        profile_failures += 1
+                except Exception as e:
+                    logging.error(f"Error processing profile {attendee.get('profile_url')}: {e}")
+                    profile_failures += 1
+
+        for attendee in attendees:
+            if shutdown_requested:
+                break
+            if len(pending) >= self.profile_workers:
+                done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                collect(done)
+            pending[self.fetch_executor.submit(self.fetch_profile_once, attendee['profile_url'], event_id)] = attendee
+        collect(concurrent.futures.wait(pending).done)
+        return profiles_scraped, profile_failures
+
     def extract_all_event_links(self, events_url="https://www.dfwtrn.org/Events"):
         """Scrape the DFWTRN Events page and return a list of event URLs (attendee list pages)"""
         soup = self.get_page(events_url)
@@ -603,16 +1814,163 @@ class DFWTRNDBScraper:
         logging.info(f"Found {len(event_links)} unique event attendee list URLs.")
         return event_links
 
-    def scrape_all_events(self, events_url="https://www.dfwtrn.org/Events"):
-        """Scrape all events listed on the DFWTRN Events page"""
-        event_links = self.extract_all_event_links(events_url)
+    def scrape_all_events(self, events_url="https://www.dfwtrn.org/Events", resume=False):
+        """Scrape all events listed on the DFWTRN Events page, one at a time"""
+        event_links = self.start_crawl(events_url, resume=resume)
         for i, event_url in enumerate(event_links):
+            if shutdown_requested:
+                logging.info("Shutdown requested. Stopping...")
+                break
             logging.info(f"\n[{i+1}/{len(event_links)}] Scraping event: {event_url}")
             try:
                 self.scrape_and_load(event_url)
             except Exception as e:
                 logging.error(f"Error scraping {event_url}: {e}")
-            time.sleep(self.delay * 2)
+
+class AsyncFetchEngine:
+    """asyncio crawl driver that pipelines event, pagination and profile fetches
+    through a bounded pool; requests are paced by the scraper's shared rate limiter"""
+    def __init__(self, scraper, concurrency=8):
+        self.scraper = scraper
+        self.concurrency = max(1, concurrency)
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.concurrency)
+
+    async def _run(self, func, url):
+        """Run a blocking fetch(+parse) call in the pool once a request slot is free;
+        None without running it once shutdown has been requested"""
+        async with self._request_slots:
+            if shutdown_requested:
+                return None
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, url)
+
+    async def _run_db(self, func, *args):
+        """Run a blocking database read (or writer flush) in the pool, off the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args))
+
+    async def _load_profile(self, event_id, attendee):
+        """Fetch one profile and queue it for the writer; True if stored, False if
+        the fetch failed, None if the profile was empty or another worker owned the fetch"""
+        fetch_profile = functools.partial(self.scraper.fetch_profile_once, event_id=event_id)
+        result = await self._run(fetch_profile, attendee['profile_url'])
+        if result is None:
+            return None
+        profile_data, owner = result
+        if not owner:
+            return None
+        return self.scraper.store_profile(attendee, event_id, profile_data)
+
+    async def scrape_event(self, event_url):
+        async with self._event_slots:
+            if shutdown_requested:
+                return 0, 0
+            scraper = self.scraper
+            event_id = scraper.ensure_event(event_url)
+            if event_id is None:
+                return 0, 0
+            scraper.frontier.start(event_url, 'event', event_id)
+            first_page = await self._run(scraper.load_attendee_page, event_url)
+            if shutdown_requested:
+                # Left in flight; a --resume run picks the event up again
+                return 0, 0
+            if not first_page:
+                scraper.frontier.finish(event_url, 'event', event_id, error='attendee list fetch failed')
+                return 0, 0
+            scraper.writer.put_event_info(event_id, first_page['event_name'], first_page['event_date'])
+            live_count = first_page['registered_count']
+            if await self._run_db(scraper.event_is_unchanged, event_id, live_count):
+                logging.info(f"Event {event_id} unchanged ({live_count} attendees), skipping")
+                scraper.frontier.finish(event_url, 'event', event_id)
+                return 0, 0
+            # The first page is already parsed; fetch the rest with at most page_workers
+            # scheduled ahead of the consumer, as _ordered_map does for the threaded path
+            skip = (await self._run_db(scraper.frontier.done, first_page['pagination_links']) - {event_url}
+                    if scraper.resuming else set())
+            page_urls = [url for url in first_page['pagination_links'] if url != event_url and url not in skip]
+            fetch_page = functools.partial(scraper.fetch_attendee_page, event_id=event_id)
+            unscheduled = iter(page_urls)
+            pages = collections.deque()
+
+            def schedule_pages():
+                for url in itertools.islice(unscheduled, scraper.page_workers - len(pages)):
+                    pages.append((url, asyncio.ensure_future(self._run(fetch_page, url))))
+
+            schedule_pages()
+            attendees_seen = 0
+            attendees_scraped = 0
+            failures = 0
+            profile_tasks = {}
+
+            def queue_page(page_attendees):
+                """Queue a page's attendees and start their profile fetches right away"""
+                nonlocal attendees_seen, attendees_scraped
+                attendees_seen += len(page_attendees)
+                for attendee in page_attendees:
+                    if not scraper.writer.put_attendee(attendee, event_id):
+                        continue
+                    attendees_scraped += 1
+                    if shutdown_requested:
+                        continue
+                    if attendee.get('profile_url') and not scraper.profile_registry.is_known(attendee['profile_url']):
+                        profile_tasks[asyncio.ensure_future(self._load_profile(event_id, attendee))] = attendee
+
+            # Handle pages in page order as they arrive, without waiting for the last one
+            queue_page(first_page['attendees'])
+            while pages:
+                if shutdown_requested:
+                    break
+                page_url, page = pages.popleft()
+                page_attendees = await page
+                if shutdown_requested:
+                    break
+                schedule_pages()
+                if page_attendees is None:
+                    failures += 1
+                else:
+                    queue_page(page_attendees)
+                scraper.frontier.finish(page_url, 'page', event_id, error='fetch failed' if page_attendees is None else None)
+            logging.info(f"Event {event_id}: {attendees_seen} attendees across {len(page_urls) + 1} pages")
+            if skip and not shutdown_requested:
+                for attendee in await self._run_db(scraper.stored_profile_attendees, event_id):
+                    if not scraper.profile_registry.is_known(attendee['profile_url']):
+                        profile_tasks[asyncio.ensure_future(self._load_profile(event_id, attendee))] = attendee
+
+            # One failing profile must not cancel the others' stores
+            stored = await asyncio.gather(*profile_tasks, return_exceptions=True)
+            for attendee, result in zip(profile_tasks.values(), stored):
+                if isinstance(result, Exception):
+                    logging.error(f"Error processing profile {attendee.get('profile_url')}: {result}")
+            profiles_scraped = stored.count(True)
+            if shutdown_requested:
+                # Left in flight; a --resume run picks the event up again
+                logging.info(f"Event {event_id} interrupted: {attendees_scraped} attendees, {profiles_scraped} profiles")
+                return attendees_scraped, profiles_scraped
+            # Only a fully loaded event records the total --incremental compares against
+            if not failures and (live_count is not None or not skip):
+                scraper.writer.put_event_total(event_id, live_count if live_count is not None else attendees_seen)
+            failures += sum(1 for result in stored if result is False or isinstance(result, Exception))
+            scraper.frontier.finish(event_url, 'event', event_id,
+                                    error=f"{failures} pages or profiles failed" if failures else None)
+
+            logging.info(f"Event {event_id} complete: {attendees_scraped} attendees, {profiles_scraped} profiles")
+            return attendees_scraped, profiles_scraped
+
+    async def scrape_events(self, event_urls):
+        # Primitives are created here so they bind to the running loop
+        self._request_slots = asyncio.Semaphore(self.concurrency)
+        self._event_slots = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self.scrape_event(url) for url in event_urls), return_exceptions=True)
+        for url, result in zip(event_urls, results):
+            if isinstance(result, Exception):
+                logging.error(f"Error scraping {url}: {result}")
+        return results
+
+    def run(self, event_urls):
+        try:
+            return asyncio.run(self.scrape_events(event_urls))
+        finally:
+            self._executor.shutdown(wait=True)
 
 # --- CLI ---
 def main():
@@ -624,22 +1982,56 @@ def main():
     
     parser = argparse.ArgumentParser(description="Scrape DFWTRN event attendees and load directly into SQLite DB")
     parser.add_argument('url', nargs='?', help='Event attendee URL to scrape, or "ALL" to scrape all events')
-    parser.add_argument('--delay', type=float, default=1.0, help='Delay between requests (seconds)')
+    parser.add_argument('--delay', type=float, default=1.0, help='Seconds between requests across the whole crawl; sets the default --rate')
+    parser.add_argument('--rate', '--host-rate', type=float, default=None, help='Global requests/second ceiling shared by all workers (default: 1/--delay)')
+    parser.add_argument('--retries', type=int, default=3, help='Retries for network errors, 5xx and 429 responses (default: 3)')
     parser.add_argument('--all', action='store_true', help='Scrape all events listed on the DFWTRN Events page')
     parser.add_argument('--workers', type=int, default=1, help='Number of parallel event workers (default: 1)')
     parser.add_argument('--limit', type=int, default=None, help='Limit the number of events to scrape (only with --all)')
+    parser.add_argument('--resume', action='store_true', help='Continue an interrupted --all crawl where it left off')
+    parser.add_argument('--retry-failed', action='store_true', help='Re-run only the events, pages and profiles that failed in the last --all crawl')
+    parser.add_argument('--page-workers', type=int, default=4, help='Concurrent attendee page fetches within one event (default: 4)')
+    parser.add_argument('--profile-workers', type=int, default=4, help='Concurrent profile fetches within one event (default: 4)')
+    parser.add_argument('--parse-procs', type=int, default=0, help='Parser processes for HTML parsing, separate from fetch threads (default: 0, parse in the fetch threads)')
+    parser.add_argument('--incremental', action='store_true', help='Skip events whose attendee count is unchanged and profiles fetched within --profile-ttl days')
+    parser.add_argument('--profile-ttl', type=float, default=30, help='Days before a stored profile is re-fetched in --incremental mode (default: 30)')
+    parser.add_argument('--cache-dir', default=None, help='Directory for the on-disk HTTP response cache (enables conditional re-fetches)')
+    parser.add_argument('--offline', action='store_true', help='Replay responses from --cache-dir only, without network access')
+    parser.add_argument('--migrate', action='store_true', help='Apply pending database schema migrations and exit')
+    parser.add_argument('--backfill-dates', action='store_true', help='Fill missing ISO event dates from the scraped date text and exit')
+    parser.add_argument('--engine', choices=['threads', 'async'], default='threads', help='Fetch engine: per-event worker threads or the asyncio pipeline (default: threads)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Maximum in-flight requests for the async engine (default: 8)')
     args = parser.parse_args()
+    if args.migrate:
+        conn = sqlite3.connect(DB_FILE, timeout=60.0)
+        logging.info(f"Database schema is at version {migrate(conn)}")
+        conn.close()
+        return
+    if args.backfill_dates:
+        conn = sqlite3.connect(DB_FILE, timeout=60.0)
+        migrate(conn)
+        with conn:
+            for table, count in backfill_event_dates(conn).items():
+                logging.info(f"Backfilled event_date_iso for {count} {table} rows")
+        conn.close()
+        return
+    if args.offline and not args.cache_dir:
+        parser.error('--offline requires --cache-dir')
     
-    scraper = DFWTRNDBScraper(delay=args.delay)
+    cache = ResponseCache(args.cache_dir, offline=args.offline) if args.cache_dir else None
+    scraper = DFWTRNDBScraper(delay=args.delay, incremental=args.incremental, profile_ttl_days=args.profile_ttl, cache=cache,
+                              profile_workers=args.profile_workers, event_workers=args.workers,
+                              page_workers=args.page_workers, parse_procs=args.parse_procs,
+                              rate=args.rate, retries=args.retries)
     
     try:
         if args.all or (args.url and args.url.upper() == 'ALL'):
-            event_links = scraper.extract_all_event_links()
-            if args.limit is not None:
-                event_links = event_links[:args.limit]
+            event_links = scraper.start_crawl(resume=args.resume, retry_failed=args.retry_failed, limit=args.limit)
             logging.info(f"Scraping {len(event_links)} events...")
             
-            if args.workers > 1:
+            if args.engine == 'async':
+                AsyncFetchEngine(scraper, concurrency=args.concurrency).run(event_links)
+            elif args.workers > 1:
                 from concurrent.futures import ThreadPoolExecutor, as_completed
                 with ThreadPoolExecutor(max_workers=args.workers) as executor:
                     futures = {executor.submit(scraper.scrape_and_load, url): url for url in event_links}
@@ -678,20 +2070,24 @@ def main():
                     except KeyboardInterrupt:
                         logging.info("Interrupted by user. Stopping...")
                         break
+            counts = scraper.frontier.counts()
+            logging.info("Crawl frontier: " + ", ".join(f"{kind} {state}: {n}" for (kind, state), n in sorted(counts.items())))
+            if shutdown_requested or any(state in ('pending', 'in_flight') for _, state in counts):
+                logging.info("Crawl incomplete; continue it with --resume")
+            elif any(state == 'failed' for _, state in counts):
+                logging.info("Some URLs failed; re-run just those with --retry-failed")
         elif args.url:
             try:
-                scraper.scrape_and_load(args.url)
+                if args.engine == 'async':
+                    AsyncFetchEngine(scraper, concurrency=args.concurrency).run([args.url])
+                else:
+                    scraper.scrape_and_load(args.url)
             except KeyboardInterrupt:
                 logging.info("Interrupted by user. Stopping...")
         else:
             parser.print_help()
     finally:
-        # Always clean up database connections
-        try:
-            scraper.db_manager.close_all()
-            logging.info("Database connections closed.")
-        except Exception as e:
-            logging.error(f"Error closing database connections: {e}")
+        scraper.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
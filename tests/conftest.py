@@ -0,0 +1,105 @@
+"""Shared stand-ins for the DFWTRN site: page builders, a fake fetch() and a local HTTP server"""
+import os
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import DFWTRNDBScraper
+
+PROFILE_PAGE = b'''<html><body><div id="FunctionalBlock1_ctl00_ctl00_memberProfile_MemberForm">
+<div class="fieldContainer"><span id="f1_titleLabel">Company</span><span id="f1_TextBoxLabel">Acme</span></div>
+</div></body></html>'''
+# A private or empty profile: the member form is there but shows no fields
+EMPTY_PROFILE_PAGE = b'<html><body><div id="FunctionalBlock1_ctl00_ctl00_memberProfile_MemberForm"></div></body></html>'
+
+def build_listing(event, page, pages=2, per_page=2, profiles=True):
+    """Attendee list page `page` of `pages` for an event. Attendee i is "Person E{event}N{i}"
+    (hyphens would split the name) with profile /Sys/PublicProfile/{event}{i}"""
+    rows = []
+    for i in range((page - 1) * per_page, page * per_page):
+        name = f'Person E{event}N{i}'
+        if profiles:
+            name = f'<a href="/Sys/PublicProfile/{event}{i}">{name}</a>'
+        rows.append(f'<tr><td>01 Jun 2025</td><td>{name}</td></tr>')
+    links = ''.join(f'<a href="/event-{event}/Attendees?elp={p}">{p}</a>' for p in range(1, pages + 1))
+    return f'''<html><body><h2>Registered attendees ({pages * per_page})</h2>
+    <table id="membersTable"><tr><th>Date</th><th>Name</th></tr>{''.join(rows)}</table>{links}</body></html>'''.encode('utf-8')
+
+def site_page(url, pages=2, per_page=2, profiles=True):
+    """The stub site's page for an event list or profile URL"""
+    if '/Sys/PublicProfile/' in url:
+        return PROFILE_PAGE
+    event = int(re.search(r'/event-(\d+)/', url).group(1))
+    return build_listing(event, int(url.rsplit('=', 1)[1]), pages, per_page, profiles)
+
+@pytest.fixture
+def profile_page():
+    return PROFILE_PAGE
+
+@pytest.fixture
+def empty_profile_page():
+    return EMPTY_PROFILE_PAGE
+
+@pytest.fixture
+def site_fetch():
+    """Make a fetch() stand-in serving the stub site; URLs in `missing` fail. Every
+    requested URL is appended to fetch.requested"""
+    def make(pages=2, per_page=2, profiles=True, missing=()):
+        lock = threading.Lock()
+
+        def fetch(url):
+            with lock:
+                fetch.requested.append(url)
+            return None if url in missing else site_page(url, pages, per_page, profiles)
+        fetch.requested = []
+        return fetch
+    return make
+
+@pytest.fixture
+def make_scraper(tmp_path):
+    """Make an unpaced scraper on tmp_path/attendees.db, optionally with a stand-in
+    fetch(); every scraper made is closed at teardown"""
+    scrapers = []
+
+    def make(fetch=None, **kwargs):
+        scraper = DFWTRNDBScraper(db_file=str(tmp_path / 'attendees.db'), **{'delay': 0, 'retries': 0, **kwargs})
+        if fetch is not None:
+            scraper.fetch = fetch
+        scrapers.append(scraper)
+        return scraper
+    yield make
+    for scraper in scrapers:
+        scraper.close()
+
+@pytest.fixture
+def stub_server():
+    """Start a local keep-alive HTTP server whose GETs are answered by
+    respond(request) -> (status, headers, body); returns its base URL"""
+    servers = []
+
+    def start(respond):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                status, headers, body = respond(self)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_port}'
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,107 @@
+import os
+import sys
+import time
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import scrape_to_sql
+from scrape_to_sql import AsyncFetchEngine
+
+EVENTS = 4
+PAGES = 2
+PER_PAGE = 2
+EVENT_URL = 'https://www.dfwtrn.org/event-1/Attendees?elp=1'
+
+def test_events_pipeline_through_a_bounded_pool(make_scraper, site_fetch):
+    site = site_fetch()
+    lock = threading.Lock()
+    in_flight = [0]
+    peak = [0]
+
+    def fetch(url):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        return site(url)
+
+    scraper = make_scraper(fetch)
+    event_urls = [f'https://www.dfwtrn.org/event-{event}/Attendees?elp=1' for event in range(1, EVENTS + 1)]
+    results = AsyncFetchEngine(scraper, concurrency=3).run(event_urls)
+    scraper.writer.flush()
+    conn = scraper.db_manager.get_connection()
+    assert results == [(PAGES * PER_PAGE, PAGES * PER_PAGE)] * EVENTS
+    assert conn.execute('SELECT COUNT(*) FROM attendees').fetchone()[0] == EVENTS * PAGES * PER_PAGE
+    assert conn.execute('SELECT COUNT(*) FROM attendee_profiles').fetchone()[0] == EVENTS * PAGES * PER_PAGE
+    # Requests from different events overlap, but never beyond the pool size
+    assert 1 < peak[0] <= 3
+
+def test_database_reads_run_off_the_event_loop(make_scraper, site_fetch):
+    scraper = make_scraper(site_fetch(), incremental=True)
+    scraper.resuming = scraper.frontier.active = True
+    threads = {}
+
+    def record(name, func):
+        def wrapper(*args):
+            threads[name] = threading.current_thread()
+            return func(*args)
+        return wrapper
+
+    for name in ('event_is_unchanged', 'stored_profile_attendees'):
+        setattr(scraper, name, record(name, getattr(scraper, name)))
+    scraper.frontier.done = record('done', scraper.frontier.done)
+    # The second page counts as done, so its stored attendees are read back
+    scraper.frontier.finish('https://www.dfwtrn.org/event-1/Attendees?elp=2', 'page', 1)
+    scraper.writer.flush()
+    AsyncFetchEngine(scraper).run([EVENT_URL])
+    assert set(threads) == {'event_is_unchanged', 'done', 'stored_profile_attendees'}
+    assert threading.main_thread() not in threads.values()
+
+def test_failing_profile_does_not_cancel_the_others(make_scraper, site_fetch):
+    scraper = make_scraper(site_fetch())
+    store_profile = scraper.store_profile
+
+    def store_or_raise(attendee, event_id, profile_data):
+        if attendee['profile_url'].endswith('/10'):
+            raise RuntimeError('broken profile')
+        return store_profile(attendee, event_id, profile_data)
+
+    scraper.store_profile = store_or_raise
+    assert AsyncFetchEngine(scraper).run([EVENT_URL]) == [(PAGES * PER_PAGE, PAGES * PER_PAGE - 1)]
+
+def test_shutdown_stops_an_event_in_progress(make_scraper, site_fetch, monkeypatch):
+    site = site_fetch()
+
+    def fetch(url):
+        if url.endswith('elp=2'):
+            monkeypatch.setattr(scrape_to_sql, 'shutdown_requested', True)
+        return site(url)
+
+    # One request slot: the second list page is fetched before the first page's profiles
+    results = AsyncFetchEngine(make_scraper(fetch), concurrency=1).run([EVENT_URL])
+    assert results == [(PER_PAGE, 0)]
+    assert site.requested == [EVENT_URL, 'https://www.dfwtrn.org/event-1/Attendees?elp=2']
+
+def test_list_pages_are_scheduled_page_workers_at_a_time(make_scraper, site_fetch):
+    site = site_fetch(pages=10)
+    scraper = make_scraper(lambda url: None if '/Sys/PublicProfile/' in url else site(url), page_workers=2)
+    engine = AsyncFetchEngine(scraper, concurrency=8)
+    run = engine._run
+    scheduled = [0, 0]
+
+    async def counting_run(func, url):
+        # Counted from scheduling, not from taking a request slot
+        is_page = 'Attendees' in url
+        if is_page:
+            scheduled[0] += 1
+            scheduled[1] = max(scheduled[1], scheduled[0])
+        try:
+            return await run(func, url)
+        finally:
+            if is_page:
+                scheduled[0] -= 1
+
+    engine._run = counting_run
+    assert engine.run([EVENT_URL]) == [(10 * PER_PAGE, 0)]
+    assert scheduled[1] == 2
@@ -0,0 +1,55 @@
+import os
+import sys
+import json
+import pytest
+from bs4 import BeautifulSoup
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import parse_attendee_page, scan_attendee_tables
+
+BASE_URL = 'https://www.dfwtrn.org/event-6176250/Attendees?elp=1'
+
+PROFILE_LINKS_PAGE = b'''<html><body><table id="membersTable">
+    <tr><th>Date</th><th>Name</th></tr>
+    <tr><td>01 May 2025</td><td><a href="/Sys/PublicProfile/42">Jane Q Public</a><span> - plus 2 guests</span></td></tr>
+    <tr><td>02 May 2025</td><td>Cher</td></tr>
+    </table></body></html>'''
+
+def legacy_attendees(content, base_url=BASE_URL):
+    soup = BeautifulSoup(content, 'html.parser')
+    return scan_attendee_tables(soup, base_url)
+
+@pytest.fixture(scope='module')
+def expected():
+    """Attendees and pagination links the original per-table BeautifulSoup
+    extractor produced for each test page, checked in so parser changes show up"""
+    with open(os.path.join(os.path.dirname(__file__), 'attendee_pages_expected.json')) as f:
+        return json.load(f)
+
+@pytest.fixture
+def debug_page():
+    path = os.path.join(os.path.dirname(__file__), '..', 'debug', 'debug_page.html')
+    with open(path, 'rb') as f:
+        return f.read()
+
+def test_fast_parser_matches_original_output(debug_page, expected):
+    page = parse_attendee_page(debug_page, BASE_URL)
+    assert page['attendees'] == expected['debug_page.html']['attendees']
+    assert page['pagination_links'] == expected['debug_page.html']['pagination_links']
+    assert legacy_attendees(debug_page) == expected['debug_page.html']['attendees']
+    assert len(page['attendees']) == 10
+    assert page['registered_count'] == 98
+    assert (page['event_name'], page['event_date']) == ('DFWTRN Happy Hour - Sidecar Social - Frisco', '19 Jun 2025')
+    assert 'https://www.dfwtrn.org/event-6176250/Attendees?elp=2' in page['pagination_links']
+
+def test_fast_parser_profile_links_and_names(expected):
+    page = parse_attendee_page(PROFILE_LINKS_PAGE, BASE_URL)
+    assert page['attendees'] == expected['profile_links']['attendees']
+    assert legacy_attendees(PROFILE_LINKS_PAGE) == expected['profile_links']['attendees']
+    assert page['attendees'][0]['profile_url'] == 'https://www.dfwtrn.org/Sys/PublicProfile/42'
+    assert (page['attendees'][0]['first_name'], page['attendees'][0]['last_name']) == ('Jane', 'Q Public')
+    assert page['attendees'][0]['guest_count'] == 2
+    assert page['registered_count'] is None
+    assert (page['event_name'], page['event_date']) == (None, None)
+
+def test_page_without_attendee_table():
+    assert parse_attendee_page(b'<html><body><table><tr><td>a</td></tr></table></body></html>', BASE_URL) is None
@@ -0,0 +1,79 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from attendee_dashboard import fts_query, search_attendees
+from scrape_to_sql import SCHEMA, migrate
+
+@pytest.fixture
+def db(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+    conn.row_factory = sqlite3.Row
+    migrate(conn)
+    conn.execute("INSERT INTO events (id, event_name, event_date) VALUES (1, 'Meetup', '01 Jun 2025')")
+    conn.executemany('INSERT INTO attendees (id, event_id, event_date, full_name, first_name, last_name, profile_url) VALUES (?, 1, ?, ?, ?, ?, ?)', [
+        (1, '01 Jun 2025', 'John Smith', 'John', 'Smith', 'u1'),
+        (2, '01 Jun 2025', 'Jane Smithers', 'Jane', 'Smithers', 'u2'),
+        (3, '01 Jun 2025', 'Bob Jones', 'Bob', 'Jones', 'u3'),
+    ])
+    conn.commit()
+    yield conn
+    conn.close()
+
+def names(db, text, column=None):
+    rows, _, _, total = search_attendees(db, fts_query(text, column), 20)
+    assert total == len(rows)
+    return [row['full_name'] for row in rows]
+
+def test_fts_query_quotes_words_as_prefixes():
+    assert fts_query('jo smi') == '"jo"* "smi"*'
+    assert fts_query('O\'Brien "x" OR') == '"O"* "Brien"* "x"* "OR"*'
+    assert fts_query('acme', 'company') == '{company} : ("acme"*)'
+    assert fts_query('  --  ') is None
+
+def test_search_matches_name_prefixes(db):
+    assert sorted(names(db, 'smith')) == ['Jane Smithers', 'John Smith']
+    assert names(db, 'jo smi') == ['John Smith']
+    assert names(db, 'nobody') == []
+
+def test_profile_fields_are_indexed_by_triggers(db):
+    db.execute("INSERT INTO attendee_profiles (attendee_id, profile_url, company, job_title) VALUES (3, 'u3', 'Acme Corp', 'Recruiter')")
+    assert names(db, 'acme') == ['Bob Jones']
+    assert names(db, 'recruit') == ['Bob Jones']
+    assert names(db, 'acme', 'company') == ['Bob Jones']
+    assert names(db, 'jones', 'company') == []
+    db.execute("UPDATE attendee_profiles SET company = 'Initech' WHERE attendee_id = 3")
+    assert names(db, 'acme') == []
+    assert names(db, 'initech') == ['Bob Jones']
+    db.execute('DELETE FROM attendees WHERE id = 3')
+    assert names(db, 'initech') == []
+
+def test_names_rank_above_profile_matches(db):
+    db.execute("INSERT INTO attendee_profiles (attendee_id, profile_url, company) VALUES (3, 'u3', 'Smith & Co')")
+    assert names(db, 'smith')[-1] == 'Bob Jones'
+
+def test_existing_rows_are_backfilled(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'old.db'))
+    conn.row_factory = sqlite3.Row
+    conn.executescript(SCHEMA)
+    conn.execute("INSERT INTO attendees (id, event_id, full_name, profile_url) VALUES (7, 1, 'Ada Lovelace', 'u7')")
+    conn.execute("INSERT INTO attendee_profiles (attendee_id, profile_url, company) VALUES (7, 'u7', 'Analytical Engines')")
+    conn.commit()
+    migrate(conn)
+    assert names(conn, 'analytical') == ['Ada Lovelace']
+    conn.close()
+
+def test_api_search(db, monkeypatch):
+    db.commit()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db.execute('PRAGMA database_list').fetchone()['file'])
+    client = attendee_dashboard.app.test_client()
+    body = client.get('/api/search?q=smi&per_page=1').get_json()
+    assert body['success'] and body['meta']['total'] == 2
+    assert len(body['data']) == 1 and body['meta']['prev_cursor'] is None
+    rest = client.get('/api/search?q=smi&per_page=1&after=' + body['meta']['next_cursor']).get_json()
+    assert len(rest['data']) == 1 and rest['meta']['next_cursor'] is None
+    assert {body['data'][0]['id'], rest['data'][0]['id']} == {1, 2}
+    assert client.get('/api/search').status_code == 400
+    assert client.get('/search?q=smith').status_code == 200
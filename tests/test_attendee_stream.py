@@ -0,0 +1,54 @@
+import os
+import sys
+import sqlite3
+import threading
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import AsyncFetchEngine
+
+EVENT_URL = 'https://www.dfwtrn.org/event-7/Attendees?elp=1'
+LAST_PAGE = 'https://www.dfwtrn.org/event-7/Attendees?elp=3'
+PAGES = 3
+PER_PAGE = 2
+
+@pytest.fixture
+def scraper(tmp_path, make_scraper, site_fetch):
+    """A scraper whose last attendee list page is only served once the earlier pages'
+    rows are in the database and a profile has been fetched, or after 5 seconds"""
+    site = site_fetch(pages=PAGES, per_page=PER_PAGE)
+    profile_fetched = threading.Event()
+
+    def fetch(url):
+        if '/Sys/PublicProfile/' in url:
+            profile_fetched.set()
+        elif url == LAST_PAGE:
+            started = profile_fetched.wait(5)
+            scraper.writer.flush()
+            conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+            rows = conn.execute('SELECT COUNT(*) FROM attendees').fetchone()[0]
+            conn.close()
+            scraper.seen_at_last_page.append((rows, started))
+        return site(url)
+
+    scraper = make_scraper(fetch, page_workers=1)
+    scraper.profile_fetched = profile_fetched
+    scraper.seen_at_last_page = []
+    return scraper
+
+def test_attendees_are_yielded_page_by_page(scraper):
+    attendees = scraper.extract_all_attendees(EVENT_URL)
+    assert next(attendees)['name'] == 'Person E7N0'
+    # The last page has not been fetched yet
+    assert scraper.seen_at_last_page == []
+    scraper.profile_fetched.set()
+    assert [attendee['name'] for attendee in attendees] == [f'Person E7N{i}' for i in range(1, PAGES * PER_PAGE)]
+
+@pytest.mark.parametrize('engine', ['threads', 'async'])
+def test_rows_and_profiles_do_not_wait_for_the_last_page(scraper, engine):
+    if engine == 'async':
+        results = AsyncFetchEngine(scraper, concurrency=4).run([EVENT_URL])
+    else:
+        results = [scraper.scrape_and_load(EVENT_URL)]
+    assert results == [(PAGES * PER_PAGE, PAGES * PER_PAGE)]
+    rows, profile_started = scraper.seen_at_last_page[0]
+    assert rows >= PER_PAGE and profile_started
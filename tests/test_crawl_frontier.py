@@ -0,0 +1,105 @@
+import os
+import sys
+import types
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+@pytest.fixture
+def site(stub_server, site_fetch, empty_profile_page):
+    """The stub site over HTTP: two-page attendee lists whose attendees all have
+    profiles. Paths in `failing` answer 404 and profiles in `empty` show no fields;
+    every requested path is appended to `requests_seen`"""
+    fetch = site_fetch()
+    site = types.SimpleNamespace(requests_seen=[], failing=set(), empty=set())
+
+    def respond(request):
+        site.requests_seen.append(request.path)
+        if request.path in site.failing:
+            return 404, {}, b''
+        if request.path in site.empty:
+            return 200, {}, empty_profile_page
+        return 200, {}, fetch(site.url + request.path)
+    site.url = stub_server(respond)
+    return site
+
+@pytest.fixture
+def crawl(make_scraper, site):
+    """Run a crawl step with a fresh scraper, as a new process would"""
+    event_urls = [f'{site.url}/event-{event}/Attendees?elp=1' for event in (1, 2)]
+
+    def run(events=None, **kwargs):
+        scraper = make_scraper()
+        scraper.extract_all_event_links = lambda events_url: event_urls
+        try:
+            pending = scraper.start_crawl(**kwargs)
+            for url in pending[:events]:
+                scraper.scrape_and_load(url)
+            conn = scraper.db_manager.get_connection()
+            scraper.writer.flush()
+            state = {row['url'].replace(site.url, ''): (row['state'], row['attempts'])
+                     for row in conn.execute('SELECT url, state, attempts FROM crawl_frontier')}
+            profiles = conn.execute('SELECT COUNT(*) FROM attendee_profiles').fetchone()[0]
+            return [url.replace(site.url, '') for url in pending], state, profiles
+        finally:
+            scraper.close()
+    return run
+
+def test_resume_and_retry_failed(crawl, site):
+    # First run: event 1's second profile fails, then the crawl dies before event 2
+    site.failing.add('/Sys/PublicProfile/11')
+    pending, state, profiles = crawl(events=1)
+    assert pending == ['/event-1/Attendees?elp=1', '/event-2/Attendees?elp=1']
+    assert state['/event-1/Attendees?elp=1'] == ('failed', 1)
+    assert state['/event-1/Attendees?elp=2'] == ('done', 1)
+    assert state['/Sys/PublicProfile/11'] == ('failed', 1)
+    assert state['/event-2/Attendees?elp=1'] == ('pending', 0)
+    assert profiles == 3
+
+    # Resume: only event 2 is left; failed work waits for --retry-failed
+    site.requests_seen.clear()
+    pending, state, profiles = crawl(resume=True)
+    assert pending == ['/event-2/Attendees?elp=1']
+    assert not any(path.startswith('/event-1') for path in site.requests_seen)
+    assert profiles == 7
+
+    # Retry failed: event 1 again, but only its first page and the failed profile are fetched
+    site.failing.clear()
+    site.requests_seen.clear()
+    pending, state, profiles = crawl(retry_failed=True)
+    assert pending == ['/event-1/Attendees?elp=1']
+    assert site.requests_seen == ['/event-1/Attendees?elp=1', '/Sys/PublicProfile/11']
+    assert state['/Sys/PublicProfile/11'] == ('done', 2)
+    assert {value[0] for value in state.values()} == {'done'}
+    assert profiles == 8
+
+def test_in_flight_work_is_requeued_on_resume(crawl, tmp_path):
+    crawl(events=0)
+    # Simulate a crash while event 1 was being scraped
+    conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+    with conn:
+        conn.execute("UPDATE crawl_frontier SET state = 'in_flight', attempts = 1 WHERE url LIKE '%event-1%'")
+    conn.close()
+    pending, _, _ = crawl(resume=True, events=0)
+    assert pending == ['/event-1/Attendees?elp=1', '/event-2/Attendees?elp=1']
+    # A fresh crawl starts over
+    pending, state, _ = crawl(events=0)
+    assert all(value == ('pending', 0) for value in state.values())
+
+def test_empty_profile_is_done_not_failed(crawl, site):
+    site.empty.add('/Sys/PublicProfile/11')
+    _, state, profiles = crawl(events=1)
+    assert state['/Sys/PublicProfile/11'] == ('done', 1)
+    assert state['/event-1/Attendees?elp=1'] == ('done', 1)
+    assert profiles == 3
+
+def test_single_url_run_then_resume(crawl, site, make_scraper):
+    # A single-URL run records nothing, so a later --all --resume still enumerates the events
+    scraper = make_scraper()
+    scraper.scrape_and_load(f'{site.url}/event-1/Attendees?elp=1')
+    assert scraper.frontier.counts() == {}
+    scraper.close()
+    pending, state, profiles = crawl(resume=True)
+    assert pending == ['/event-1/Attendees?elp=1', '/event-2/Attendees?elp=1']
+    assert {value[0] for value in state.values()} == {'done'}
+    assert profiles == 8
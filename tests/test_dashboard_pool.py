@@ -0,0 +1,94 @@
+import os
+import sys
+import sqlite3
+import threading
+import concurrent.futures
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from scrape_to_sql import SCHEMA, DatabaseManager, ATTENDEE_INSERT_SQL, attendee_row, migrate
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = DatabaseManager(db_file).get_connection()  # WAL, as the scraper opens it
+    migrate(conn)
+    conn.execute("INSERT INTO events (id, event_name) VALUES (1, 'Meetup')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    return db_file
+
+def test_connections_are_reused_and_read_only(db_file):
+    client = attendee_dashboard.app.test_client()
+    for _ in range(5):
+        assert client.get('/api/events').status_code == 200
+    pool = attendee_dashboard.get_pool()
+    assert pool._created == 1
+    conn = pool.acquire()
+    try:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO events (id, event_name) VALUES (2, 'Nope')")
+    finally:
+        pool.release(conn)
+
+def test_readers_run_while_scrape_writes(db_file):
+    writer = DatabaseManager(db_file)
+    done = threading.Event()
+
+    def scrape():
+        conn = writer.get_connection()
+        for batch in range(40):
+            with conn:
+                conn.executemany(ATTENDEE_INSERT_SQL, [
+                    attendee_row({'date': '01 Jun 2025', 'name': f'Person {batch}-{i}'}, 1) for i in range(50)])
+        done.set()
+
+    def read(_):
+        client = attendee_dashboard.app.test_client()
+        statuses = []
+        while not done.is_set():
+            statuses += [client.get(url).status_code for url in ('/', '/api/attendees?limit=20', '/attendees')]
+        return statuses
+
+    scraper = threading.Thread(target=scrape)
+    scraper.start()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(read, range(6)))
+    scraper.join()
+    writer.close_all()
+
+    assert all(status == 200 for statuses in results for status in statuses)
+    assert attendee_dashboard.get_pool()._created <= attendee_dashboard.app.config['DB_POOL_SIZE']
+    body = attendee_dashboard.app.test_client().get('/api/attendees?limit=1').get_json()
+    assert body[0]['full_name'].startswith('Person 39-')
+
+def test_unmigrated_database_is_refused_with_a_hint(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'old.db')
+    conn = sqlite3.connect(db_file)
+    conn.executescript(SCHEMA)  # as the baseline scraper left it
+    conn.close()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    client = attendee_dashboard.app.test_client()
+    response = client.get('/events')
+    assert response.status_code == 503
+    assert 'scrape_to_sql.py --migrate' in response.get_data(as_text=True)
+    assert attendee_dashboard.get_pool()._created == 0
+
+    conn = sqlite3.connect(db_file)
+    migrate(conn)
+    conn.close()
+    assert client.get('/events').status_code == 200
+
+def test_exhausted_pool_answers_503(db_file, monkeypatch):
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DB_POOL_SIZE', 1)
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DB_POOL_TIMEOUT', 0.1)
+    pool = attendee_dashboard.get_pool()
+    conn = pool.acquire()  # held, as by a long export
+    try:
+        response = attendee_dashboard.app.test_client().get('/api/events')
+        assert response.status_code == 503
+        assert 'busy' in response.get_data(as_text=True)
+    finally:
+        pool.release(conn)
+    assert attendee_dashboard.app.test_client().get('/api/events').status_code == 200
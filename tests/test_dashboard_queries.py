@@ -0,0 +1,81 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from attendee_dashboard import encode_cursor
+from scrape_to_sql import migrate
+
+ROUTES = [
+    '/',
+    '/events',
+    '/attendees?after=' + encode_cursor(['2025-06-03', 150]),
+    '/attendees?before=' + encode_cursor(['2025-06-03', 150]),
+    '/event/1?after=' + encode_cursor(['2025-06-01', 100]),
+    '/attendee/1',
+    '/api/attendees',
+    '/api/attendees?event_id=1',
+    '/api/events',
+    '/api/attendees?from=2025-06-02&to=2025-06-04',
+    '/api/attendees?event_id=2&from=2025-06-02',
+    '/events?from=2025-06-02&to=2025-06-04',
+    '/search?q=first1',
+    '/search?q=first1&after=' + encode_cursor([-1.5, 12]),
+    '/api/search?q=co&event_id=1',
+    '/api/search?company=co1',
+]
+
+@pytest.fixture
+def traced_queries(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = sqlite3.connect(db_file)
+    migrate(conn)
+    conn.executemany('INSERT INTO events (id, event_name, event_date, event_date_iso) VALUES (?, ?, ?, ?)',
+                     [(e, f'Event {e}', f'{e:02d} Jun 2025', f'2025-06-{e:02d}') for e in range(1, 6)])
+    conn.executemany('''
+        INSERT INTO attendees (event_id, event_date, event_date_iso, full_name, first_name, last_name, profile_url, is_anonymous)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', [(i % 5 + 1, f'{i % 5 + 1:02d} Jun 2025', f'2025-06-{i % 5 + 1:02d}', f'Last{i}, First{i}', f'First{i}', f'Last{i}',
+           f'https://example.com/p/{i}', i % 7 == 0) for i in range(200)])
+    conn.executemany('INSERT INTO attendee_profiles (attendee_id, profile_url, company) VALUES (?, ?, ?)',
+                     [(i + 1, f'https://example.com/p/{i}', f'Co{i}') for i in range(0, 200, 3)])
+    conn.commit()
+    conn.close()
+
+    statements = []
+    pooled_get_db = attendee_dashboard.get_db
+
+    def get_db():
+        db = pooled_get_db()
+        db.set_trace_callback(statements.append)
+        return db
+
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    monkeypatch.setattr(attendee_dashboard, 'get_db', get_db)
+    attendee_dashboard.app.config['TESTING'] = True
+    client = attendee_dashboard.app.test_client()
+    for route in ROUTES:
+        assert client.get(route).status_code == 200, route
+    # FTS5 reads its own shadow tables ('main'.'attendee_search_*') through the same trace
+    return db_file, [s for s in statements if s.lstrip().upper().startswith('SELECT') and "'main'." not in s]
+
+def query_plan(db_file, statement):
+    conn = sqlite3.connect(db_file)
+    try:
+        return [row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + statement)]
+    finally:
+        conn.close()
+
+def test_dashboard_queries_use_indexes(traced_queries):
+    db_file, statements = traced_queries
+    assert statements
+    for statement in statements:
+        plan = query_plan(db_file, statement)
+        details = '\n'.join(plan)
+        # Every table access is an index search or an index-ordered scan
+        assert not [step for step in plan if step.startswith('SCAN') and 'INDEX' not in step], (statement, details)
+        for step in plan:
+            if 'USE TEMP B-TREE' in step:
+                # Only ranking full-text matches may need a sort, and it sorts just the matches
+                assert ' MATCH ' in statement.upper() and step.endswith('ORDER BY'), (statement, details)
@@ -0,0 +1,68 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import SCHEMA, migrate
+
+def recomputed(conn):
+    """The aggregates the dashboard used to run on every page load"""
+    return {
+        'dashboard': conn.execute('''
+            SELECT (SELECT COUNT(*) FROM attendees), (SELECT COUNT(*) FROM attendees WHERE is_anonymous = 1),
+                   (SELECT COUNT(*) FROM events), (SELECT COUNT(*) FROM attendee_profiles)
+        ''').fetchone(),
+        'events': conn.execute('''
+            SELECT event_id, COUNT(*), SUM(is_anonymous = 1) FROM attendees GROUP BY event_id ORDER BY event_id
+        ''').fetchall(),
+    }
+
+def maintained(conn):
+    return {
+        'dashboard': conn.execute('''
+            SELECT total_attendees, anonymous_attendees, total_events, total_profiles FROM dashboard_stats
+        ''').fetchone(),
+        'events': conn.execute('''
+            SELECT event_id, attendees, anonymous_attendees FROM event_stats WHERE attendees > 0 ORDER BY event_id
+        ''').fetchall(),
+    }
+
+def add_attendees(conn, rows):
+    conn.executemany('''
+        INSERT INTO attendees (event_id, event_date, full_name, first_name, last_name, is_anonymous)
+        VALUES (?, '01 Jun 2025', ?, ?, ?, ?)
+    ''', rows)
+
+ROWS = [(1, 'Ann Lee', 'Ann', 'Lee', False), (2, 'Ann Lee', 'Ann', 'Lee', False),
+        (2, 'Bo Chan', 'Bo', 'Chan', False), (2, 'Anonymous', '', '', True)]
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+    yield conn
+    conn.close()
+
+def test_stats_backfilled_by_migration(conn):
+    conn.executescript(SCHEMA)
+    conn.executemany('INSERT INTO events (id, event_name) VALUES (?, ?)', [(1, 'One'), (2, 'Two')])
+    add_attendees(conn, ROWS)
+    conn.execute("INSERT INTO attendee_profiles (attendee_id, profile_url) VALUES (1, 'u1')")
+    conn.commit()
+    migrate(conn)
+    assert maintained(conn) == recomputed(conn)
+
+def test_stats_follow_inserts_updates_and_deletes(conn):
+    migrate(conn)
+    conn.executemany('INSERT INTO events (id, event_name) VALUES (?, ?)', [(1, 'One'), (2, 'Two'), (3, 'Three')])
+    add_attendees(conn, ROWS)
+    conn.execute("INSERT INTO attendee_profiles (attendee_id, profile_url) VALUES (1, 'u1')")
+    assert maintained(conn) == recomputed(conn)
+
+    conn.execute("UPDATE attendees SET first_name = 'Bob' WHERE full_name = 'Bo Chan'")
+    conn.execute("UPDATE attendees SET event_id = 3, is_anonymous = 1 WHERE id = 2")
+    assert maintained(conn) == recomputed(conn)
+
+    conn.execute("DELETE FROM attendees WHERE first_name = 'Ann'")
+    conn.execute('DELETE FROM attendee_profiles')
+    conn.execute('DELETE FROM events WHERE id = 1')
+    assert maintained(conn) == recomputed(conn)
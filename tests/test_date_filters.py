@@ -0,0 +1,63 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from attendee_dashboard import date_format
+from scrape_to_sql import DFWTRNDBScraper, migrate, backfill_event_dates
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = sqlite3.connect(db_file)
+    migrate(conn)
+    # Written without ISO dates, as an older scraper would have
+    conn.executemany('INSERT INTO events (id, event_name, event_date) VALUES (?, ?, ?)',
+                     [(1, 'Winter', '15 Jan 2024'), (2, 'Spring', '12 Mar 2024'), (3, 'Summer', '01 Jul 2024'), (4, 'TBD', None)])
+    conn.executemany('INSERT INTO attendees (event_id, event_date, full_name) VALUES (?, ?, ?)',
+                     [(1, '10 Jan 2024', 'A'), (2, '02 Mar 2024', 'B'), (2, '11 Mar 2024', 'C'), (3, '30 Jun 2024', 'D')])
+    with conn:
+        assert backfill_event_dates(conn) == {'attendees': 4, 'events': 3}
+        assert backfill_event_dates(conn) == {'attendees': 0, 'events': 0}
+    conn.close()
+    return db_file
+
+@pytest.fixture
+def client(db_file, monkeypatch):
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    return attendee_dashboard.app.test_client()
+
+def test_date_format():
+    assert date_format('2024-03-02') == 'March 02, 2024'
+    assert date_format('', '2 Mar 2024') == '2 Mar 2024'
+    assert date_format(None) == ''
+
+def test_api_attendees_date_range(client):
+    names = lambda url: [row['full_name'] for row in client.get(url).get_json()]
+    assert names('/api/attendees?from=2024-03-01&to=2024-03-31') == ['C', 'B']
+    assert names('/api/attendees?from=2024-03-05') == ['D', 'C']
+    assert names('/api/attendees?to=2024-03-02&event_id=2') == ['B']
+    assert client.get('/api/attendees?from=03/01/2024').status_code == 400
+
+def test_events_date_range(client):
+    html = client.get('/events?from=2024-02-01&to=2024-12-31').get_data(as_text=True)
+    assert 'Spring' in html and 'Summer' in html and 'Winter' not in html and 'TBD' not in html
+    assert 'March 12, 2024' in html
+
+def test_scraped_event_is_found_by_date(client, db_file):
+    # The scraper stores the name and date shown on the event's attendee list
+    path = os.path.join(os.path.dirname(__file__), '..', 'debug', 'debug_page.html')
+    with open(path, 'rb') as f:
+        first_page = f.read()
+    event_url = 'https://www.dfwtrn.org/event-6176250/Attendees?elp=1'
+    scraper = DFWTRNDBScraper(db_file=db_file, delay=0, retries=0)
+    scraper.fetch = lambda url: first_page if url == event_url else None
+    try:
+        scraper.scrape_and_load(event_url)
+        scraper.writer.flush()
+    finally:
+        scraper.close()
+    html = client.get('/events?from=2025-06-01&to=2025-06-30').get_data(as_text=True)
+    assert 'DFWTRN Happy Hour - Sidecar Social - Frisco' in html and 'June 19, 2025' in html
+    assert 'Spring' not in html
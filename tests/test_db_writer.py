@@ -0,0 +1,95 @@
+import os
+import sys
+import time
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import DatabaseManager, DBWriter, migrate
+
+PROFILE = 'https://www.dfwtrn.org/Sys/PublicProfile/42'
+
+def attendee(name, profile_url=None):
+    return {'date': '01 Jun 2025', 'name': name, 'first_name': name, 'last_name': '', 'profile_url': profile_url}
+
+@pytest.fixture
+def db_file(tmp_path):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = sqlite3.connect(db_file)
+    migrate(conn)
+    conn.close()
+    return db_file
+
+@pytest.fixture
+def make_writer(db_file):
+    writers = []
+
+    def make(**kwargs):
+        db_manager = DatabaseManager(db_file)
+        writers.append((DBWriter(db_manager, **kwargs), db_manager))
+        return writers[-1][0]
+    yield make
+    for writer, db_manager in writers:
+        writer.close()
+        db_manager.close_all()
+
+def count(db_file, table='attendees'):
+    conn = sqlite3.connect(db_file)
+    try:
+        return conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+    finally:
+        conn.close()
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+def test_commits_after_batch_size_rows(db_file, make_writer):
+    writer = make_writer(batch_size=3, flush_interval=60)
+    writer.put_attendee(attendee('A'), 1)
+    writer.put_attendee(attendee('B'), 1)
+    time.sleep(0.2)
+    assert count(db_file) == 0
+    writer.put_attendee(attendee('C'), 1)
+    assert wait_for(lambda: count(db_file) == 3)
+
+def test_commits_after_flush_interval(db_file, make_writer):
+    writer = make_writer(batch_size=1000, flush_interval=0.3)
+    started = time.monotonic()
+    writer.put_attendee(attendee('A'), 1)
+    assert count(db_file) == 0
+    assert wait_for(lambda: count(db_file) == 1)
+    assert time.monotonic() - started >= 0.3
+
+def test_flush_commits_everything_queued(db_file, make_writer):
+    writer = make_writer(batch_size=1000, flush_interval=60)
+    for name in 'ABCDE':
+        writer.put_attendee(attendee(name), 1)
+    writer.flush()
+    assert count(db_file) == 5
+
+@pytest.mark.parametrize('batch_size', [1, 500])
+def test_profile_lands_after_its_attendee(db_file, make_writer, batch_size):
+    writer = make_writer(batch_size=batch_size)
+    writer.put_attendee(attendee('Grace', PROFILE), 1)
+    writer.put_profile(attendee('Grace', PROFILE), 1, {'company': 'Navy'})
+    writer.flush()
+    conn = sqlite3.connect(db_file)
+    row = conn.execute('''
+        SELECT a.full_name, p.company FROM attendee_profiles p JOIN attendees a ON a.id = p.attendee_id
+    ''').fetchone()
+    conn.close()
+    assert row == ('Grace', 'Navy')
+
+def test_bad_row_does_not_drop_its_batch(db_file, make_writer):
+    writer = make_writer(batch_size=1000, flush_interval=60)
+    writer.put_attendee(attendee('A'), 1)
+    writer._queue.put(('attendee', ('not', 'a', 'row')))
+    writer.put_attendee(attendee('B'), 1)
+    writer.put_frontier('https://www.dfwtrn.org/event-1/Attendees?elp=1', 'event', 'done', 1)
+    writer.flush()
+    assert count(db_file) == 2
+    assert count(db_file, 'crawl_frontier') == 1
@@ -0,0 +1,49 @@
+import os
+import io
+import sys
+import csv
+import json
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from scrape_to_sql import migrate
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = sqlite3.connect(db_file)
+    migrate(conn)
+    conn.executemany('INSERT INTO events (id, event_name) VALUES (?, ?)', [(1, 'One'), (2, 'Two')])
+    conn.executemany('''
+        INSERT INTO attendees (event_id, event_date, event_date_iso, full_name, first_name, last_name, profile_url)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    ''', [(i % 2 + 1, f'{i % 28 + 1:02d} Feb 2025', f'2025-02-{i % 28 + 1:02d}', f'Person, {i}', 'Person', str(i), f'u{i + 1}')
+          for i in range(2500)])
+    conn.execute("INSERT INTO attendee_profiles (attendee_id, profile_url, company) VALUES (1, 'u1', 'Acme, Inc.')")
+    conn.commit()
+    conn.close()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    return attendee_dashboard.app.test_client()
+
+def test_ndjson_streams_every_row(client):
+    response = client.get('/api/export')
+    assert response.is_streamed and response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert [row['id'] for row in rows] == list(range(1, 2501))
+    assert rows[0]['company'] == 'Acme, Inc.' and rows[0]['event_name'] == 'One'
+
+def test_csv_with_filters(client):
+    response = client.get('/api/export?format=csv&event_id=1&from=2025-02-01&to=2025-02-02')
+    assert 'attendees.csv' in response.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert rows and {row['event_id'] for row in rows} == {'1'}
+    assert {row['event_date_iso'] for row in rows} <= {'2025-02-01', '2025-02-02'}
+    assert rows[0]['full_name'].startswith('Person, ')
+
+def test_csv_header_only_when_nothing_matches(client):
+    text = client.get('/api/export?format=csv&event_id=99').get_data(as_text=True)
+    assert text.strip() == ','.join(attendee_dashboard.EXPORT_COLUMNS)
+
+def test_export_rejects_unknown_format(client):
+    assert client.get('/api/export?format=xml').status_code == 400
@@ -0,0 +1,50 @@
+import os
+import sys
+import time
+import threading
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+@pytest.fixture
+def scraper(make_scraper, profile_page):
+    """A scraper whose fetches take 20 ms and record how many ran at once"""
+    lock = threading.Lock()
+
+    def fetch(url):
+        with lock:
+            scraper.in_flight += 1
+            scraper.peak = max(scraper.peak, scraper.in_flight)
+        time.sleep(0.02)
+        with lock:
+            scraper.in_flight -= 1
+        return None if url.endswith('/missing') else profile_page
+
+    scraper = make_scraper(fetch, profile_workers=2)
+    scraper.in_flight = scraper.peak = 0
+    return scraper
+
+def test_load_profiles_runs_profile_workers_at_a_time(scraper):
+    urls = [f'https://www.dfwtrn.org/Sys/PublicProfile/{i}' for i in range(6)] + ['https://www.dfwtrn.org/missing']
+    attendees = [{'name': f'Person {i}', 'date': '01 Jun 2025', 'profile_url': url} for i, url in enumerate(urls)]
+    assert scraper.load_profiles(1, attendees) == (6, 1)
+    assert scraper.peak == 2
+    scraper.writer.flush()
+    conn = scraper.db_manager.get_connection()
+    assert conn.execute('SELECT COUNT(*) FROM attendee_profiles').fetchone()[0] == 6
+
+def test_ordered_map_keeps_order_and_limit(scraper):
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def work(i):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        # Later items finish first, so results arrive out of order
+        time.sleep(0.01 * (10 - i))
+        with lock:
+            running[0] -= 1
+        return i * i
+
+    assert list(scraper._ordered_map(work, range(10), 3)) == [i * i for i in range(10)]
+    assert running[1] == 3
@@ -0,0 +1,56 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import AsyncFetchEngine
+
+EVENT_URL = 'https://www.dfwtrn.org/event-7/Attendees?elp=1'
+
+@pytest.fixture
+def crawl(make_scraper, site_fetch):
+    """Make a function that runs one --incremental crawl of EVENT_URL with a fresh
+    scraper, as a new process would, and returns (scraper's fetch, stored attendees,
+    stored total)"""
+    def run(engine, **site):
+        fetch = site_fetch(**site)
+        scraper = make_scraper(fetch, incremental=True, profile_ttl_days=30)
+        try:
+            if engine == 'async':
+                AsyncFetchEngine(scraper).run([EVENT_URL])
+            else:
+                scraper.scrape_and_load(EVENT_URL)
+            scraper.writer.flush()
+            conn = scraper.db_manager.get_connection()
+            attendees = conn.execute('SELECT COUNT(*) FROM attendees').fetchone()[0]
+            total = conn.execute('SELECT total_attendees FROM events WHERE id = 7').fetchone()[0]
+            return fetch, attendees, total
+        finally:
+            scraper.close()
+    return run
+
+@pytest.mark.parametrize('engine', ['threads', 'async'])
+def test_partly_loaded_event_is_crawled_again(crawl, engine):
+    # The second list page fails: no total is recorded for the event
+    fetch, attendees, total = crawl(engine, profiles=False, missing={'https://www.dfwtrn.org/event-7/Attendees?elp=2'})
+    assert (attendees, total, len(fetch.requested)) == (2, None, 2)
+    # So the next run does not take it as unchanged, and fills in the missing rows
+    fetch, attendees, total = crawl(engine, profiles=False)
+    assert (attendees, total, len(fetch.requested)) == (4, 4, 2)
+    # Once complete, an unchanged event stops after its first page
+    fetch, attendees, total = crawl(engine, profiles=False)
+    assert (attendees, total, len(fetch.requested)) == (4, 4, 1)
+
+@pytest.mark.parametrize('engine', ['threads', 'async'])
+def test_profiles_are_refetched_after_profile_ttl(crawl, engine, tmp_path):
+    def profiles_fetched(fetch):
+        return sorted(url.rsplit('/', 1)[1] for url in fetch.requested if '/Sys/PublicProfile/' in url)
+
+    assert profiles_fetched(crawl(engine, pages=1, per_page=2)[0]) == ['70', '71']
+    # Profile 70 was stored 40 days ago, profile 71 is within the 30-day TTL
+    conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+    with conn:
+        conn.execute("UPDATE attendee_profiles SET last_updated = datetime('now', '-40 days') WHERE profile_url LIKE '%/70'")
+    conn.close()
+    # A new attendee makes the event changed, so its profiles are looked at again
+    assert profiles_fetched(crawl(engine, pages=1, per_page=3)[0]) == ['70', '72']
@@ -0,0 +1,69 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from scrape_to_sql import SCHEMA, migrate, parse_event_date
+
+DATES = ['05 Jan 2024', '12 Mar 2024', '9 Feb 2025', '01 Dec 2023']
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = sqlite3.connect(db_file)
+    # Rows written before the sortable date column existed, then upgraded
+    conn.executescript(SCHEMA)
+    conn.executemany('INSERT INTO attendees (event_id, event_date, full_name) VALUES (?, ?, ?)',
+                     [(i % 2 + 1, DATES[i % len(DATES)], f'Person {i}') for i in range(57)])
+    conn.commit()
+    migrate(conn)
+    conn.close()
+
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    return attendee_dashboard.app.test_client()
+
+def walk(client, url, cursor_key):
+    pages, cursor = [], None
+    while True:
+        response = client.get(url + (f'&{cursor_key}={cursor}' if cursor else ''))
+        pages.append(response.get_json())
+        cursor = response.headers.get({'after': 'X-Next-Cursor', 'before': 'X-Prev-Cursor'}[cursor_key])
+        if not cursor:
+            return pages
+
+def test_parse_event_date():
+    assert parse_event_date('12 Mar 2024') == '2024-03-12'
+    assert parse_event_date(' 9 February 2025 ') == '2025-02-09'
+    assert parse_event_date('TBD') == ''
+
+def test_pages_cover_every_row_newest_first(client):
+    pages = walk(client, '/api/attendees?limit=10', 'after')
+    assert [len(page) for page in pages] == [10, 10, 10, 10, 10, 7]
+    rows = [row for page in pages for row in page]
+    assert len({row['id'] for row in rows}) == 57
+    keys = [(row['event_date_iso'], row['id']) for row in rows]
+    assert keys == sorted(keys, reverse=True)
+    assert keys[0][0] == '2025-02-09' and keys[-1][0] == '2023-12-01'
+
+def test_prev_cursor_walks_back_to_first_page(client):
+    first = client.get('/api/attendees?limit=10')
+    second = client.get('/api/attendees?limit=10&after=' + first.headers['X-Next-Cursor'])
+    back = client.get('/api/attendees?limit=10&before=' + second.headers['X-Prev-Cursor'])
+    assert back.get_json() == first.get_json()
+    assert 'X-Prev-Cursor' not in back.headers
+    # The Link header carries the same cursors with the other query parameters
+    assert f'/api/attendees?limit=10&after={second.headers["X-Next-Cursor"]}>; rel="next"' in second.headers['Link']
+    assert 'rel="prev"' in second.headers['Link']
+    # A cached page replays its cursor headers
+    assert client.get('/api/attendees?limit=10').headers['X-Next-Cursor'] == first.headers['X-Next-Cursor']
+
+def test_event_filter_and_bad_cursor(client):
+    rows = [row for page in walk(client, '/api/attendees?event_id=2&limit=7', 'after') for row in page]
+    assert len(rows) == 28 and {row['event_id'] for row in rows} == {2}
+    assert client.get('/api/attendees?after=not-a-cursor').status_code == 400
+    assert client.get('/attendees?after=not-a-cursor').status_code == 400
+    # Well-formed JSON whose values are not sort keys
+    for values in ([{'a': 1}, 2], [[1], 2], ['2024-01-01', None], [True, 2]):
+        cursor = attendee_dashboard.encode_cursor(values)
+        assert client.get('/api/attendees?after=' + cursor).status_code == 400
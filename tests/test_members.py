@@ -0,0 +1,102 @@
+import os
+import sys
+import sqlite3
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from scrape_to_sql import SCHEMA, MIGRATIONS, DatabaseManager, DBWriter, member_key, migrate
+
+PROFILE = 'https://www.dfwtrn.org/Sys/PublicProfile/42'
+
+def attendee(name, date='01 Jun 2025', profile_url=None, is_anonymous=False):
+    first, _, last = name.partition(' ')
+    return {'date': date, 'name': name, 'first_name': first, 'last_name': last,
+            'profile_url': profile_url, 'is_anonymous': is_anonymous}
+
+def leaderboard(conn):
+    return [tuple(row) for row in conn.execute('''
+        SELECT member_key, attendance_count FROM members WHERE attendance_count > 0
+        ORDER BY attendance_count DESC, member_key
+    ''').fetchall()]
+
+def recounted(conn):
+    return [tuple(row) for row in conn.execute('''
+        SELECT m.member_key, COUNT(*) FROM attendees a JOIN members m ON m.id = a.member_id
+        GROUP BY m.id ORDER BY 2 DESC, 1
+    ''').fetchall()]
+
+def test_member_key():
+    assert member_key(PROFILE, 'Grace Hopper') == PROFILE
+    assert member_key(None, '  Grace   HOPPER ') == 'name:grace hopper'
+    assert member_key(None, 'Anonymous', True) is None
+    assert member_key(None, '') is None
+
+def test_writer_links_attendances_to_members(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / 'attendees.db'))
+    migrate(db_manager.get_connection())
+    writer = DBWriter(db_manager)
+    for event_id in (1, 2, 3):
+        writer.put_attendee(attendee('Grace Hopper', profile_url=PROFILE), event_id)
+    writer.put_attendee(attendee('Ann Lee'), 1)
+    writer.put_attendee(attendee('ann  lee'), 2)
+    writer.put_attendee(attendee('Ann Lee'), 1)  # duplicate row, ignored
+    writer.put_attendee(attendee('Anonymous', is_anonymous=True), 1)
+    writer.close()
+
+    conn = db_manager.get_connection()
+    assert leaderboard(conn) == [(PROFILE, 3), ('name:ann lee', 2)]
+    assert leaderboard(conn) == recounted(conn)
+    assert conn.execute('SELECT member_id FROM attendees WHERE is_anonymous = 1').fetchone()[0] is None
+
+    conn.execute("DELETE FROM attendees WHERE full_name = 'ann  lee'")
+    conn.execute("UPDATE attendees SET member_id = (SELECT id FROM members WHERE member_key = 'name:ann lee') WHERE id = 1")
+    assert leaderboard(conn) == [(PROFILE, 2), ('name:ann lee', 2)] == recounted(conn)
+    db_manager.close_all()
+
+def test_writer_keeps_the_latest_spelling(tmp_path):
+    db_manager = DatabaseManager(str(tmp_path / 'attendees.db'))
+    migrate(db_manager.get_connection())
+    writer = DBWriter(db_manager)
+    writer.put_attendee(attendee('Grace Hopper', profile_url=PROFILE), 1)
+    writer.put_attendee(attendee('G. Hopper', profile_url=PROFILE), 2)
+    writer.close()
+    conn = db_manager.get_connection()
+    # Same name the migration backfill picks for these rows (see below)
+    assert conn.execute('SELECT full_name FROM members WHERE member_key = ?', (PROFILE,)).fetchone()[0] == 'G. Hopper'
+    assert leaderboard(conn) == [(PROFILE, 2)] == recounted(conn)
+    db_manager.close_all()
+
+def test_members_backfilled_by_migration(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+    conn.executescript(SCHEMA)
+    # Apply every step before the one that creates members, then add rows as an older scraper would
+    steps = MIGRATIONS[:next(i for i, step in enumerate(MIGRATIONS)
+                             if isinstance(step, str) and 'CREATE TABLE IF NOT EXISTS members' in step)]
+    for step in steps:
+        step(conn) if callable(step) else conn.executescript(step)
+    conn.execute(f'PRAGMA user_version = {len(steps)}')
+    conn.executemany('''
+        INSERT INTO attendees (event_id, event_date, full_name, first_name, last_name, profile_url, is_anonymous)
+        VALUES (?, '01 Jun 2025', ?, '', '', ?, ?)
+    ''', [(1, 'Grace Hopper', PROFILE, 0), (2, 'G. Hopper', PROFILE, 0), (1, 'Ann Lee', None, 0),
+          (2, 'Ann Lee', None, 0), (3, 'ANN LEE', None, 0), (1, 'Anonymous', None, 1)])
+    conn.commit()
+    migrate(conn)
+    assert leaderboard(conn) == [('name:ann lee', 3), (PROFILE, 2)] == recounted(conn)
+    # The member keeps the newest spelling of its name
+    assert conn.execute('SELECT full_name FROM members WHERE member_key = ?', (PROFILE,)).fetchone()[0] == 'G. Hopper'
+    conn.close()
+
+def test_index_lists_top_members(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    db_manager = DatabaseManager(db_file)
+    migrate(db_manager.get_connection())
+    writer = DBWriter(db_manager)
+    for event_id in (1, 2):
+        writer.put_attendee(attendee('Grace Hopper', profile_url=PROFILE), event_id)
+    writer.put_attendee(attendee('Ann Lee'), 1)
+    writer.close()
+    db_manager.close_all()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+
+    page = attendee_dashboard.app.test_client().get('/').get_data(as_text=True)
+    assert page.index('Grace Hopper') < page.index('Ann Lee')
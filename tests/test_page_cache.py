@@ -0,0 +1,87 @@
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from attendee_dashboard import PageCache
+from scrape_to_sql import DatabaseManager, migrate
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    manager = DatabaseManager(db_file)  # WAL, as the scraper writes it
+    conn = manager.get_connection()
+    migrate(conn)
+    conn.execute("INSERT INTO events (id, event_name) VALUES (1, 'First Event')")
+    conn.commit()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    yield conn
+    manager.close_all()
+
+@pytest.fixture
+def queries(monkeypatch):
+    executed = []
+    pooled_get_db = attendee_dashboard.get_db
+
+    def get_db():
+        db = pooled_get_db()
+        db.set_trace_callback(executed.append)
+        return db
+
+    monkeypatch.setattr(attendee_dashboard, 'get_db', get_db)
+    return executed
+
+def test_repeat_requests_skip_sqlite_and_revalidate(db, queries):
+    client = attendee_dashboard.app.test_client()
+    first = client.get('/api/events')
+    assert first.status_code == 200 and first.headers['ETag']
+    assert queries
+
+    queries.clear()
+    again = client.get('/api/events')
+    assert again.get_data() == first.get_data() and again.headers['ETag'] == first.headers['ETag']
+    not_modified = client.get('/api/events', headers={'If-None-Match': first.headers['ETag']})
+    assert not_modified.status_code == 304 and not not_modified.get_data()
+    assert queries == []
+
+def test_writes_invalidate_cached_pages(db, queries):
+    client = attendee_dashboard.app.test_client()
+    first = client.get('/api/events')
+    db.execute("INSERT INTO events (id, event_name) VALUES (2, 'Second Event')")
+    db.commit()
+    queries.clear()
+    fresh = client.get('/api/events', headers={'If-None-Match': first.headers['ETag']})
+    assert fresh.status_code == 200 and queries
+    assert 'Second Event' in fresh.get_data(as_text=True)
+    assert fresh.headers['ETag'] != first.headers['ETag']
+
+def test_commit_that_leaves_wal_size_and_mtime_alone_invalidates(db):
+    client = attendee_dashboard.app.test_client()
+    db.execute("UPDATE events SET event_name = 'Renamed Event' WHERE id = 1")
+    db.commit()
+    # After a checkpoint the next commit rewrites the WAL from its start
+    db.execute('PRAGMA wal_checkpoint(RESTART)')
+    assert 'Renamed Event' in client.get('/api/events').get_data(as_text=True)
+    wal = attendee_dashboard.app.config['DATABASE'] + '-wal'
+    before = os.stat(wal)
+    db.execute("UPDATE events SET event_name = 'Reworded Event' WHERE id = 1")
+    db.commit()
+    # A coarse clock leaves mtime unchanged too: stat() alone sees no difference
+    os.utime(wal, ns=(before.st_atime_ns, before.st_mtime_ns))
+    after = os.stat(wal)
+    assert (after.st_ino, after.st_size, after.st_mtime_ns) == (before.st_ino, before.st_size, before.st_mtime_ns)
+    assert 'Reworded Event' in client.get('/api/events').get_data(as_text=True)
+
+def test_query_strings_are_cached_separately(db):
+    client = attendee_dashboard.app.test_client()
+    assert client.get('/events?from=2025-01-01').get_data() != client.get('/events').get_data()
+    assert client.get('/api/attendees?from=bad').status_code == 400
+
+def test_page_cache_evicts_least_recently_used():
+    cache = PageCache(max_entries=2)
+    cache.put('a', 1, 'A')
+    cache.put('b', 1, 'B')
+    assert cache.get('a', 1) == 'A'
+    cache.put('c', 1, 'C')
+    assert cache.get('b', 1) is None and cache.get('a', 1) == 'A' and cache.get('c', 1) == 'C'
+    assert cache.get('a', 2) is None
@@ -0,0 +1,31 @@
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import parse_attendee_listing
+
+BASE_URL = 'https://www.dfwtrn.org/event-6176250/Attendees?elp=1'
+PROFILE_URL = 'https://www.dfwtrn.org/Sys/PublicProfile/42'
+# No #membersTable, so the generic table scan has to run in the parse process too
+FALLBACK_PAGE = b'''<html><body><h2>Registered attendees (2)</h2><table>
+<tr><td>01 May 2025</td><td><a href="/Sys/PublicProfile/42">Jane Public</a></td></tr>
+<tr><td>02 May 2025</td><td>Cher</td></tr>
+</table><a href="?elp=2">2</a></body></html>'''
+
+@pytest.fixture
+def pages(profile_page):
+    with open(os.path.join(os.path.dirname(__file__), '..', 'debug', 'debug_page.html'), 'rb') as f:
+        debug_page = f.read()
+    return {BASE_URL: debug_page, BASE_URL + '&fallback': FALLBACK_PAGE, PROFILE_URL: profile_page}
+
+def test_parse_processes_match_inline_parsing(make_scraper, pages):
+    inline = make_scraper(pages.get, parse_procs=0)
+    pooled = make_scraper(pages.get, parse_procs=2)
+    assert pooled.parse_executor is not None and inline.parse_executor is None
+    for url in (BASE_URL, BASE_URL + '&fallback'):
+        assert pooled.load_attendee_page(url) == inline.load_attendee_page(url) == parse_attendee_listing(pages[url], url)
+    assert pooled.load_attendee_page(BASE_URL + '&fallback')['registered_count'] == 2
+    assert pooled.extract_profile_data(PROFILE_URL) == inline.extract_profile_data(PROFILE_URL)
+    assert pooled.extract_profile_data(PROFILE_URL)['company'] == 'Acme'
+    # Nothing is sent to the pool for a failed fetch
+    assert pooled.load_attendee_page('https://www.dfwtrn.org/missing') is None
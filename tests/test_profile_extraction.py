@@ -19,4 +19,22 @@ def test_profile_extraction(filename):
     assert any(data.get(field) for field in ['company', 'job_title', 'email', 'phone']), f"No profile data extracted from {filename}"
     # Email, if present, should look like an email
     if data.get('email'):
-        assert '@' in data['email'], f"Email field not valid in {filename}: {data['email']}" 
\ No newline at end of file
+        assert '@' in data['email'], f"Email field not valid in {filename}: {data['email']}"
+
+
+PROFILE_HTML = b'''<html><body><div class="header"><span id="menu_titleLabel">Menu</span></div>
+<div id="FunctionalBlock1_memberProfile_MemberForm">
+  <div class="fieldContainer"><span id="a_titleLabel">Company</span><span id="a_TextBoxLabel">Acme Staffing</span></div>
+  <div class="fieldContainer"><span id="b_titleLabel">Work e-mail</span><span id="b_TextBoxLabel"><a href="mailto:angela@example.com">angela@example.com</a></span></div>
+  <div class="fieldContainer"><span id="c_titleLabel">Favorite Event</span><span id="c_TextBoxLabel">Happy Hour</span></div>
+</div>
+<span id="FunctionalBlock1_membershipDetails">Individual</span></body></html>'''
+
+def test_profile_extraction_from_bytes():
+    data = extract_profile_data_from_html(PROFILE_HTML)
+    assert data == {
+        'company': 'Acme Staffing',
+        'email': 'angela@example.com',
+        'favorite_event': 'Happy Hour',
+        'membership_level': 'Individual',
+    }
@@ -0,0 +1,45 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import attendee_dashboard
+from attendee_dashboard import fts_query, search_attendees
+from scrape_to_sql import migrate
+
+PROFILE = 'https://www.dfwtrn.org/Sys/PublicProfile/42'
+
+@pytest.fixture
+def db_file(tmp_path, monkeypatch):
+    db_file = str(tmp_path / 'attendees.db')
+    conn = sqlite3.connect(db_file)
+    migrate(conn)
+    conn.executemany('INSERT INTO events (id, event_name) VALUES (?, ?)', [(1, 'March'), (2, 'April'), (3, 'May')])
+    add = 'INSERT INTO attendees (id, event_id, event_date_iso, full_name, profile_url) VALUES (?, ?, ?, ?, ?)'
+    conn.executemany(add, [(1, 1, '2025-03-01', 'Grace Hopper', PROFILE), (2, 2, '2025-04-01', 'Grace Hopper', PROFILE)])
+    # The profile is stored once, against the attendance that first fetched it
+    conn.execute('INSERT INTO attendee_profiles (attendee_id, profile_url, company, job_title) VALUES (1, ?, ?, ?)',
+                 (PROFILE, 'Navy', 'Rear Admiral'))
+    # A later attendance by the same person picks the profile up too
+    conn.execute(add, (3, 3, '2025-05-01', 'Grace Hopper', PROFILE))
+    conn.commit()
+    conn.close()
+    monkeypatch.setitem(attendee_dashboard.app.config, 'DATABASE', db_file)
+    return db_file
+
+def test_every_attendance_shows_the_profile(db_file):
+    client = attendee_dashboard.app.test_client()
+    rows = client.get('/api/attendees').get_json()
+    assert [(row['id'], row['company']) for row in rows] == [(3, 'Navy'), (2, 'Navy'), (1, 'Navy')]
+    page = client.get('/attendee/2').get_data(as_text=True)
+    assert 'Rear Admiral' in page and PROFILE in page
+
+def test_search_finds_every_attendance_by_profile_fields(db_file):
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    rows, _, _, total = search_attendees(conn, fts_query('navy'), 10)
+    assert total == 3 and {row['id'] for row in rows} == {1, 2, 3}
+    conn.execute("UPDATE attendee_profiles SET company = 'Univac' WHERE profile_url = ?", (PROFILE,))
+    assert search_attendees(conn, fts_query('navy'), 10)[3] == 0
+    assert search_attendees(conn, fts_query('univac'), 10)[3] == 3
+    conn.close()
@@ -0,0 +1,39 @@
+import os
+import sys
+import time
+import concurrent.futures
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import ProfileRegistry
+
+def test_concurrent_requests_share_one_fetch():
+    calls = []
+
+    def loader(url):
+        calls.append(url)
+        time.sleep(0.1)
+        return {'company': 'Acme'}
+
+    registry = ProfileRegistry()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: registry.fetch_once('https://example.com/p/1', loader), range(8)))
+
+    assert calls == ['https://example.com/p/1']
+    assert sum(owner for _, owner in results) == 1
+    assert all(data == {'company': 'Acme'} for data, _ in results)
+    # Once loaded, the URL is skipped for the rest of the run
+    assert registry.fetch_once('https://example.com/p/1', loader) == (None, False)
+    assert len(calls) == 1
+
+def test_known_and_failed_urls():
+    registry = ProfileRegistry(['https://example.com/p/stored'])
+    assert registry.is_known('https://example.com/p/stored')
+    assert registry.fetch_once('https://example.com/p/stored', lambda url: {'x': 1}) == (None, False)
+    # A failed fetch is not recorded, so the profile can be retried later in the run
+    assert registry.fetch_once('https://example.com/p/2', lambda url: None) == (None, True)
+    assert not registry.is_known('https://example.com/p/2')
+    # A fetched page without profile fields (private or empty) is not fetched again
+    calls = []
+    empty = lambda url: calls.append(url) or {}
+    assert registry.fetch_once('https://example.com/p/3', empty) == ({}, True)
+    assert registry.fetch_once('https://example.com/p/3', empty) == (None, False)
+    assert calls == ['https://example.com/p/3']
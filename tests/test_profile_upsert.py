@@ -0,0 +1,75 @@
+import os
+import sys
+import sqlite3
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import SCHEMA, MIGRATIONS, DFWTRNDBScraper, migrate
+
+PROFILE = 'https://www.dfwtrn.org/Sys/PublicProfile/42'
+OTHER = 'https://www.dfwtrn.org/Sys/PublicProfile/43'
+
+def attendee(name, profile_url):
+    return {'date': '01 Jun 2025', 'name': name, 'first_name': name, 'last_name': '', 'profile_url': profile_url}
+
+def stored(conn, profile_url):
+    profile = conn.execute('SELECT id, company, job_title, content_hash FROM attendee_profiles WHERE profile_url = ?',
+                           (profile_url,)).fetchone()
+    fields = conn.execute('SELECT id, field_name, field_value FROM profile_fields WHERE profile_id = ? ORDER BY field_name',
+                          (profile['id'],)).fetchall()
+    return tuple(profile), [tuple(field) for field in fields]
+
+@pytest.fixture
+def scraper(tmp_path):
+    scraper = DFWTRNDBScraper(db_file=str(tmp_path / 'attendees.db'), delay=0)
+    yield scraper
+    scraper.close()
+
+def test_writer_refreshes_changed_profiles_only(scraper):
+    writer = scraper.writer
+    for name, url in (('Grace', PROFILE), ('Ann', OTHER)):
+        writer.put_attendee(attendee(name, url), 1)
+    writer.put_profile(attendee('Grace', PROFILE), 1, {'company': 'Navy', 'LinkedIn': 'grace', 'Pronouns': 'she/her'})
+    writer.put_profile(attendee('Ann', OTHER), 1, {'company': 'Acme', 'LinkedIn': 'ann'})
+    writer.flush()
+    conn = scraper.db_manager.get_connection()
+    before = stored(conn, OTHER)
+
+    # A later crawl sees Grace's new job and a dropped field; Ann is unchanged
+    writer.put_profile(attendee('Grace', PROFILE), 1, {'company': 'Univac', 'title': 'Director', 'LinkedIn': 'grace'})
+    writer.put_profile(attendee('Ann', OTHER), 1, {'LinkedIn': 'ann', 'company': 'Acme'})
+    writer.flush()
+    (_, company, job_title, _), fields = stored(conn, PROFILE)
+    assert (company, job_title) == ('Univac', 'Director')
+    assert [field[1:] for field in fields] == [('LinkedIn', 'grace')]
+    # Same row ids and hash: nothing was rewritten
+    assert stored(conn, OTHER) == before
+    # The search index follows the refreshed company
+    assert conn.execute("SELECT full_name FROM attendee_search WHERE attendee_search MATCH 'univac'").fetchall()[0][0] == 'Grace'
+
+def test_upsert_profile_returns_id_and_updates(scraper):
+    attendee_id = scraper.upsert_attendee(attendee('Grace', PROFILE), 1)
+    profile_id = scraper.upsert_profile(attendee_id, PROFILE, {'company': 'Navy', 'Pronouns': 'she/her'})
+    assert profile_id is not None
+    assert scraper.upsert_profile(attendee_id, PROFILE, {'company': 'Univac', 'Pronouns': 'she/her'}) == profile_id
+    (_, company, _, _), fields = stored(scraper.db_manager.get_connection(), PROFILE)
+    assert company == 'Univac' and [field[1:] for field in fields] == [('Pronouns', 'she/her')]
+
+def test_migration_dedupes_profile_fields(tmp_path):
+    conn = sqlite3.connect(str(tmp_path / 'attendees.db'))
+    conn.executescript(SCHEMA)
+    # Apply every step before the one that adds content_hash, then add rows as an older scraper would
+    steps = MIGRATIONS[:next(i for i, step in enumerate(MIGRATIONS)
+                             if isinstance(step, str) and 'content_hash' in step)]
+    for step in steps:
+        step(conn) if callable(step) else conn.executescript(step)
+    conn.execute(f'PRAGMA user_version = {len(steps)}')
+    conn.execute("INSERT INTO attendee_profiles (id, profile_url, company) VALUES (1, ?, 'Navy')", (PROFILE,))
+    conn.executemany("INSERT INTO profile_fields (profile_id, field_name, field_value) VALUES (1, ?, ?)",
+                     [('LinkedIn', 'old'), ('Pronouns', 'she/her'), ('LinkedIn', 'grace'), ('Pronouns', 'she/her')])
+    conn.commit()
+    migrate(conn)
+    assert conn.execute('SELECT field_name, field_value FROM profile_fields ORDER BY field_name').fetchall() == [
+        ('LinkedIn', 'grace'), ('Pronouns', 'she/her')]
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO profile_fields (profile_id, field_name, field_value) VALUES (1, 'LinkedIn', 'x')")
+    conn.close()
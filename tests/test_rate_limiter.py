@@ -0,0 +1,105 @@
+import os
+import sys
+import time
+import types
+import concurrent.futures
+from email.utils import formatdate
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import scrape_to_sql
+from scrape_to_sql import RateLimiter, retry_after_seconds
+
+BODY = b'<html><body>ok</body></html>'
+
+# Statuses for the stub server to answer with, in order; 200 once they run out
+script = []
+# Paths of every request the stub server received
+requests_seen = []
+
+@pytest.fixture
+def stub_url(stub_server, monkeypatch):
+    monkeypatch.setattr(scrape_to_sql, 'RETRY_BACKOFF', 0.01)
+    script.clear()
+    requests_seen.clear()
+
+    def respond(request):
+        requests_seen.append(request.path)
+        status = script.pop(0) if script else 200
+        headers = {'Retry-After': '0.1'} if status in (429, 503) else {}
+        return status, headers, BODY if status == 200 else b''
+    return stub_server(respond) + '/event-1/Attendees?elp=1'
+
+def test_one_ceiling_across_threads_without_bursts(monkeypatch):
+    # A frozen clock: each thread's sleep is exactly how far ahead its reserved slot lies
+    sleeps = []
+    monkeypatch.setattr(scrape_to_sql, 'time', types.SimpleNamespace(monotonic=lambda: 100.0, sleep=sleeps.append))
+    limiter = RateLimiter(50)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: limiter.acquire(), range(40)))
+    # The first request goes at once and every other one gets its own slot 1/50 s after the previous
+    assert sorted(sleeps) == pytest.approx([i / 50 for i in range(1, 40)])
+
+def test_backoff_halves_rate_and_recovers_additively():
+    limiter = RateLimiter(10)
+    limiter.backoff()
+    limiter.backoff()
+    assert limiter.rate == 2.5
+    for _ in range(5):
+        limiter.success()
+    assert limiter.rate == 5.0
+    for _ in range(50):
+        limiter.success()
+    assert limiter.rate == 10
+    for _ in range(10):
+        limiter.backoff()
+    assert limiter.rate == limiter.min_rate
+
+def test_retry_after_pauses_every_request():
+    limiter = RateLimiter()
+    started = time.monotonic()
+    limiter.backoff(retry_after=0.2)
+    limiter.acquire()
+    assert time.monotonic() - started >= 0.2
+
+def test_retry_after_seconds():
+    assert retry_after_seconds('3') == 3.0
+    assert retry_after_seconds(formatdate(time.time() - 60, usegmt=True)) == 0.0
+    assert 50 < retry_after_seconds(formatdate(time.time() + 60, usegmt=True)) <= 60
+    assert retry_after_seconds('86400') == scrape_to_sql.MAX_RETRY_AFTER
+    assert retry_after_seconds('soon') is None
+    assert retry_after_seconds(None) is None
+
+def test_fetch_backs_off_and_retries(make_scraper, stub_url):
+    scraper = make_scraper(rate=100, retries=3)
+    script[:] = [429, 503, 502]
+    started = time.monotonic()
+    assert scraper.fetch(stub_url) == BODY
+    assert len(requests_seen) == 4
+    # Two Retry-After pauses, and the shared rate is still recovering
+    assert time.monotonic() - started >= 0.2
+    assert scraper.rate_limiter.rate < 100
+
+    # Client errors are not retried
+    requests_seen.clear()
+    script[:] = [404]
+    assert scraper.fetch(stub_url) is None
+    assert len(requests_seen) == 1
+
+    # Give up after `retries` retries
+    requests_seen.clear()
+    script[:] = [500] * 10
+    assert scraper.fetch(stub_url) is None
+    assert len(requests_seen) == 4
+
+def test_fetch_retries_network_errors(make_scraper, monkeypatch):
+    monkeypatch.setattr(scrape_to_sql, 'RETRY_BACKOFF', 0.01)
+    scraper = make_scraper(retries=2)
+    attempts = []
+
+    def refuse(url, **kwargs):
+        attempts.append(url)
+        raise scrape_to_sql.requests.ConnectionError('connection refused')
+
+    monkeypatch.setattr(scraper.session, 'get', refuse)
+    assert scraper.fetch('http://127.0.0.1:9/') is None
+    assert len(attempts) == 3
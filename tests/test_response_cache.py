@@ -0,0 +1,45 @@
+import os
+import sys
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import ResponseCache
+
+BODY = b'<html><body><h2>Registered attendees (3)</h2></body></html>'
+ETAG = '"v1"'
+# Headers of every request the stub server received
+requests_seen = []
+
+@pytest.fixture
+def stub_url(stub_server):
+    """Stub server that answers 304 to a matching If-None-Match"""
+    requests_seen.clear()
+
+    def respond(request):
+        requests_seen.append(dict(request.headers))
+        if request.headers.get('If-None-Match') == ETAG:
+            return 304, {}, b''
+        return 200, {'ETag': ETAG}, BODY
+    return stub_server(respond) + '/event-1/Attendees?elp=1'
+
+@pytest.fixture
+def cached_scraper(tmp_path, make_scraper):
+    def make(offline=False):
+        return make_scraper(cache=ResponseCache(str(tmp_path / 'cache'), offline=offline))
+    return make
+
+def test_revalidates_and_serves_304_from_cache(cached_scraper, stub_url):
+    scraper = cached_scraper()
+    assert scraper.fetch(stub_url) == BODY
+    assert scraper.fetch(stub_url) == BODY
+    assert 'If-None-Match' not in requests_seen[0]
+    assert requests_seen[1]['If-None-Match'] == ETAG
+
+def test_offline_mode_replays_without_network(cached_scraper, stub_url):
+    scraper = cached_scraper()
+    scraper.fetch(stub_url)
+    scraper.close()
+
+    offline = cached_scraper(offline=True)
+    assert offline.fetch(stub_url) == BODY
+    assert offline.fetch(stub_url + '&elp=2') is None
+    assert len(requests_seen) == 1
@@ -0,0 +1,45 @@
+import os
+import sys
+import threading
+import pytest
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from scrape_to_sql import SessionManager
+
+@pytest.fixture
+def site(stub_server):
+    """Keep-alive stub server recording the client (host, port) of every request:
+    one port per TCP connection"""
+    clients = []
+
+    def respond(request):
+        clients.append(request.client_address)
+        return 200, {}, b'<html><body>ok</body></html>'
+    return stub_server(respond), clients
+
+def test_one_session_per_thread():
+    manager = SessionManager(pool_size=4)
+    sessions = []
+    thread = threading.Thread(target=lambda: sessions.append(manager.get_session()))
+    thread.start()
+    thread.join()
+    assert manager.get_session() is manager.get_session()
+    assert sessions[0] is not manager.get_session()
+    assert manager.get_session().get_adapter('https://www.dfwtrn.org')._pool_maxsize == 4
+    manager.close_all()
+
+def test_worker_threads_reuse_their_connection(make_scraper, site):
+    base_url, clients = site
+    scraper = make_scraper()
+
+    def crawl(worker):
+        for i in range(5):
+            assert scraper.fetch(f'{base_url}/event-1/Attendees?elp={worker}{i}')
+
+    threads = [threading.Thread(target=crawl, args=(worker,)) for worker in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Ten requests over two keep-alive connections, one per thread's session
+    assert len(clients) == 10
+    assert len(set(clients)) == 2
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Attendee list parse benchmark
+Compares the generic BeautifulSoup table scan (html.parser tree, every
+<table> and <tr>) with parse_attendee_page's single lxml pass over the
+#membersTable rows, and reports rows/sec for each.
+
+Usage: python tools/bench_attendee_parse.py [attendees.html ...]
+Defaults to debug/debug_page.html and tests/test_events.html.
+"""
+
+import os
+import sys
+import timeit
+from bs4 import BeautifulSoup
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from scrape_to_sql import parse_attendee_page, scan_attendee_tables
+
+BASE_URL = 'https://www.dfwtrn.org/event-6176250/Attendees?elp=1'
+DEFAULT_PAGES = [
+    os.path.join(ROOT, 'debug', 'debug_page.html'),
+    os.path.join(ROOT, 'tests', 'test_events.html'),
+]
+
+def legacy_parse(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    # Unbound use: the table scan needs no scraper state
+    return scan_attendee_tables(soup, BASE_URL)
+
+def fast_parse(content):
+    page = parse_attendee_page(content, BASE_URL)
+    return page['attendees'] if page else legacy_parse(content)
+
+def main():
+    for path in sys.argv[1:] or DEFAULT_PAGES:
+        with open(path, 'rb') as f:
+            content = f.read()
+        rows = legacy_parse(content)
+        assert fast_parse(content) == rows, f"Output mismatch for {path}"
+        runs = 50
+        before = timeit.timeit(lambda: legacy_parse(content), number=runs) / runs
+        after = timeit.timeit(lambda: fast_parse(content), number=runs) / runs
+        note = '' if parse_attendee_page(content, BASE_URL) else ' (no #membersTable, generic fallback)'
+        print(f"{os.path.relpath(path, ROOT)}: {len(rows)} rows, {len(content)} bytes{note}")
+        print(f"  before: {before * 1000:.2f} ms/page, {len(rows) / before:,.0f} rows/sec")
+        print(f"  after:  {after * 1000:.2f} ms/page, {len(rows) / after:,.0f} rows/sec ({before / after:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Dashboard index page benchmark
+Builds a synthetic attendees database (1M rows by default) and compares the
+landing page computed with the original per-request aggregates (three
+COUNT(*)s, an anonymous count and a GROUP BY over every named attendee)
+against the current index() route, which reads the trigger-maintained
+dashboard_stats table and the top of the members attendance index.
+
+Usage: python tools/bench_dashboard_index.py [rows] [db_path]
+The database (default: bench_dashboard.db in the temp dir) is built once
+and reused on later runs.
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import random
+import tempfile
+import timeit
+from flask import render_template
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+import attendee_dashboard
+from scrape_to_sql import backfill_members, migrate
+
+FIRST_NAMES = [f'First{i}' for i in range(400)]
+LAST_NAMES = [f'Last{i}' for i in range(250)]
+
+def build(db_path, rows):
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    existing = conn.execute('SELECT total_attendees FROM dashboard_stats').fetchone()[0]
+    if existing >= rows:
+        conn.close()
+        return
+    started = time.perf_counter()
+    rng = random.Random(42)
+    events = rows // 250
+    with conn:
+        conn.executemany('INSERT OR IGNORE INTO events (id, event_name, event_date) VALUES (?, ?, ?)',
+                         ((e, f'Event {e}', '01 Jun 2025') for e in range(events)))
+
+        def attendees():
+            # About ten attendances per person, so members repeat across events
+            for i in range(existing, rows):
+                person = rng.randrange(max(1, rows // 10))
+                first, last = FIRST_NAMES[person % len(FIRST_NAMES)], LAST_NAMES[person % len(LAST_NAMES)]
+                anonymous = rng.random() < 0.15
+                yield (i % events, '01 Jun 2025', '2025-06-01', f'{first} {last} {person}', first, last,
+                       None if anonymous else f'https://example.com/p/{person}', anonymous)
+
+        conn.executemany('''
+            INSERT OR IGNORE INTO attendees (event_id, event_date, event_date_iso, full_name, first_name, last_name, profile_url, is_anonymous)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', attendees())
+        conn.execute('''
+            INSERT OR IGNORE INTO attendee_profiles (attendee_id, profile_url, company)
+            SELECT id, profile_url, 'Co' || (id % 1000) FROM attendees WHERE id % 3 = 0 AND profile_url IS NOT NULL
+        ''')
+        # Bulk rows skip the scraper's write path, so link their members in one pass
+        backfill_members(conn)
+    conn.execute('ANALYZE')
+    conn.close()
+    print(f"Built {rows:,} attendees in {time.perf_counter() - started:.1f}s")
+
+def get_db_for(db_path):
+    def get_db():
+        db = sqlite3.connect(db_path)
+        db.row_factory = sqlite3.Row
+        return db
+    return get_db
+
+def legacy_index():
+    """The index() route as it was before dashboard_stats"""
+    db = attendee_dashboard.get_db()
+    total_attendees = db.execute('SELECT COUNT(*) FROM attendees').fetchone()[0]
+    total_events = db.execute('SELECT COUNT(*) FROM events').fetchone()[0]
+    total_profiles = db.execute('SELECT COUNT(*) FROM attendee_profiles').fetchone()[0]
+    recent_event = db.execute('SELECT * FROM events ORDER BY created_at DESC LIMIT 1').fetchone()
+    top_names = db.execute('''
+        SELECT first_name, last_name, COUNT(*) as count
+        FROM attendees
+        WHERE is_anonymous = 0
+        GROUP BY first_name, last_name
+        ORDER BY count DESC
+        LIMIT 10
+    ''').fetchall()
+    anonymous_count = db.execute('SELECT COUNT(*) FROM attendees WHERE is_anonymous = 1').fetchone()[0]
+    db.close()
+    return render_template('index.html',
+                           total_attendees=total_attendees,
+                           total_events=total_events,
+                           total_profiles=total_profiles,
+                           recent_event=recent_event,
+                           top_names=top_names,
+                           anonymous_count=anonymous_count,
+                           named_count=total_attendees - anonymous_count)
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    db_path = sys.argv[2] if len(sys.argv) > 2 else os.path.join(tempfile.gettempdir(), 'bench_dashboard.db')
+    build(db_path, rows)
+    attendee_dashboard.get_db = get_db_for(db_path)
+    app = attendee_dashboard.app
+
+    with app.test_request_context('/'):
+        runs = 5
+        before = timeit.timeit(legacy_index, number=runs) / runs
+        # __wrapped__ skips the page cache, so every run queries SQLite
+        after = timeit.timeit(attendee_dashboard.index.__wrapped__, number=runs * 20) / (runs * 20)
+
+    print(f"{db_path}: {rows:,} attendees")
+    print(f"  before: {before * 1000:.1f} ms/page (per-request aggregates)")
+    print(f"  after:  {after * 1000:.2f} ms/page (dashboard_stats, members) ({before / after:.0f}x faster)")
+
+if __name__ == "__main__":
+    main()
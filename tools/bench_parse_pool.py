@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Parse pool benchmark
+Parses the same attendee list and profile pages on a pool of fetch-style
+threads (the default, where the GIL keeps parsing on one core) and again
+with the threads handing the bytes to --parse-procs parser processes, and
+reports pages/sec for each.
+
+Usage: python tools/bench_parse_pool.py [pages] [threads] [procs]
+Defaults: 400 pages, 16 threads, one process per CPU.
+"""
+
+import os
+import sys
+import time
+import tempfile
+import concurrent.futures
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from scrape_to_sql import DFWTRNDBScraper
+
+BASE_URL = 'https://www.dfwtrn.org/event-6176250/Attendees?elp=1'
+
+def crawl(scraper, pages, threads):
+    """Load `pages` pages (alternating attendee list and profile) from `threads` threads"""
+    def load(i):
+        if i % 2:
+            return scraper.extract_profile_data(BASE_URL)
+        return scraper.load_attendee_page(BASE_URL)
+
+    started = time.perf_counter()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+        list(executor.map(load, range(pages)))
+    return time.perf_counter() - started
+
+def main():
+    pages = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    threads = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    procs = int(sys.argv[3]) if len(sys.argv) > 3 else os.cpu_count() or 1
+    with open(os.path.join(ROOT, 'debug', 'debug_page.html'), 'rb') as f:
+        content = f.read()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for parse_procs in (0, procs):
+            scraper = DFWTRNDBScraper(db_file=os.path.join(tmp, f'bench{parse_procs}.db'), parse_procs=parse_procs)
+            # Serve every URL from memory so only parsing is measured
+            scraper.fetch = lambda url: content
+            try:
+                crawl(scraper, procs * 2, threads)  # start the parse processes
+                results[parse_procs] = crawl(scraper, pages, threads)
+            finally:
+                scraper.close()
+
+    before, after = results[0], results[procs]
+    print(f"{pages} pages ({len(content)} bytes each) on {threads} threads, {os.cpu_count()} CPUs")
+    print(f"  before: {pages / before:,.0f} pages/sec (parsed in the fetch threads)")
+    print(f"  after:  {pages / after:,.0f} pages/sec (--parse-procs {procs}) ({before / after:.1f}x speedup)")
+
+if __name__ == "__main__":
+    main()
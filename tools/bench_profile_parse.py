@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Profile parse microbenchmark
+Compares the old profile path (html.parser parse, str() and a second full
+parse) with the single strained lxml parse used by extract_profile_data.
+
+Usage: python tools/bench_profile_parse.py [profile.html ...]
+Without arguments a profile form is injected into debug/debug_page.html so
+the page carries realistic site chrome.
+"""
+
+import os
+import sys
+import timeit
+from bs4 import BeautifulSoup
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from scrape_to_sql import extract_profile_data_from_html, extract_profile_data_from_soup
+
+PROFILE_FORM = '''
+<div id="FunctionalBlock1_ctl00_ctl00_memberProfile_MemberForm">
+  <div class="fieldContainer"><span id="f1_titleLabel">First name</span><span id="f1_TextBoxLabel">Angela</span></div>
+  <div class="fieldContainer"><span id="f2_titleLabel">Last name</span><span id="f2_TextBoxLabel">Bell</span></div>
+  <div class="fieldContainer"><span id="f3_titleLabel">Company</span><span id="f3_TextBoxLabel">Acme Staffing</span></div>
+  <div class="fieldContainer"><span id="f4_titleLabel">Job Function</span><span id="f4_DropDownLabel">Recruiter</span></div>
+  <div class="fieldContainer"><span id="f5_titleLabel">Work e-mail</span><span id="f5_TextBoxLabel"><a href="mailto:angela@example.com">angela@example.com</a></span></div>
+  <div class="fieldContainer"><span id="f6_titleLabel">Mobile phone</span><span id="f6_TextBoxLabel">214-555-0100</span></div>
+  <div class="fieldContainer"><span id="f7_titleLabel">City</span><span id="f7_TextBoxLabel">Dallas</span></div>
+</div>
+<span id="FunctionalBlock1_ctl00_ctl00_membershipDetails">Individual Membership</span>
+'''
+
+def load_samples(paths):
+    if paths:
+        samples = []
+        for path in paths:
+            with open(path, 'rb') as f:
+                samples.append((os.path.basename(path), f.read()))
+        return samples
+    with open(os.path.join(ROOT, 'debug', 'debug_page.html'), encoding='utf-8') as f:
+        page = f.read()
+    return [('synthetic profile', page.replace('</body>', PROFILE_FORM + '</body>').encode('utf-8'))]
+
+def legacy_extract(content):
+    soup = BeautifulSoup(content, 'html.parser')
+    return extract_profile_data_from_soup(BeautifulSoup(str(soup), 'html.parser'))
+
+def main():
+    for name, content in load_samples(sys.argv[1:]):
+        assert legacy_extract(content) == extract_profile_data_from_html(content), f"Output mismatch for {name}"
+        runs = 50
+        before = timeit.timeit(lambda: legacy_extract(content), number=runs) / runs
+        after = timeit.timeit(lambda: extract_profile_data_from_html(content), number=runs) / runs
+        print(f"{name} ({len(content)} bytes)")
+        print(f"  before: {before * 1000:.2f} ms/profile")
+        print(f"  after:  {after * 1000:.2f} ms/profile ({before / after:.1f}x faster)")
+
+if __name__ == "__main__":
+    main()
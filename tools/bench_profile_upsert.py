@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Profile write benchmark
+Writes a batch of parsed profiles (with a few dynamic fields each) the way the
+scraper used to, with INSERT OR IGNORE, a SELECT for the id and one INSERT per
+field, and again with upsert_profiles(). Each is timed for a first crawl and
+for a refresh where a tenth of the profiles changed. The report gives
+profiles/sec and the SQLite statements executed per profile.
+
+Usage: python tools/bench_profile_upsert.py [profiles]
+Defaults: 5000 profiles.
+"""
+
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+from scrape_to_sql import migrate, profile_field_rows, profile_row, upsert_profiles
+
+def make_profiles(count, version, rng):
+    profiles = []
+    for i in range(count):
+        # A refresh (version 1) changes every tenth profile
+        changed = version and i % 10 == 0
+        profile_data = {
+            'email': f'person{i}@example.com',
+            'company': f'Company {i % 300}' + (' Holdings' if changed else ''),
+            'title': rng.choice(['Recruiter', 'Director', 'Sourcer', 'Manager']) if changed else 'Recruiter',
+            'city': 'Dallas',
+            'LinkedIn': f'https://linkedin.com/in/person{i}',
+            'Industry': 'Staffing',
+            'Years Experience': str(i % 30),
+        }
+        profiles.append((i + 1, f'https://www.dfwtrn.org/Sys/PublicProfile/{i}', profile_data))
+    return profiles
+
+def legacy_write(conn, profiles):
+    """The per-profile statements the scraper issued before the bulk upsert"""
+    for attendee_id, profile_url, profile_data in profiles:
+        cur = conn.execute('''
+            INSERT OR IGNORE INTO attendee_profiles (attendee_id, profile_url, email, phone, company, job_title, bio, member_since, location, skills, certifications)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (attendee_id, profile_url) + profile_row(profile_data))
+        profile_id = cur.lastrowid or conn.execute('SELECT id FROM attendee_profiles WHERE profile_url=?',
+                                                   (profile_url,)).fetchone()[0]
+        for field_name, field_value in profile_field_rows(profile_data):
+            conn.execute('''
+                INSERT OR IGNORE INTO profile_fields (profile_id, field_name, field_value, field_type)
+                VALUES (?, ?, ?, ?)
+            ''', (profile_id, field_name, field_value, 'text'))
+
+def bulk_write(conn, profiles):
+    upsert_profiles(conn, [((attendee_id,), profile_url, profile_row(profile_data), profile_field_rows(profile_data))
+                           for attendee_id, profile_url, profile_data in profiles])
+
+def run(db_path, write, batches, trace=False):
+    """Write each batch in one transaction; returns (profiles/sec or statements/profile) per batch
+    and the profile_fields row count at the end"""
+    conn = sqlite3.connect(db_path)
+    migrate(conn)
+    if write is legacy_write:
+        # The old schema had no unique key on profile_fields
+        conn.execute('DROP INDEX idx_profile_fields_profile_name')
+    statements = 0
+
+    def count(sql):
+        nonlocal statements
+        # Statements run inside triggers are reported with a leading comment
+        if not sql.startswith('--'):
+            statements += 1
+
+    results = []
+    for profiles in batches:
+        statements = 0
+        # Tracing expands every statement's SQL, so it gets a run of its own
+        conn.set_trace_callback(count if trace else None)
+        started = time.perf_counter()
+        with conn:
+            write(conn, profiles)
+        elapsed = time.perf_counter() - started
+        results.append(statements / len(profiles) if trace else len(profiles) / elapsed)
+    conn.set_trace_callback(None)
+    fields = conn.execute('SELECT COUNT(*) FROM profile_fields').fetchone()[0]
+    conn.close()
+    return results, fields
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(42)
+    batches = [make_profiles(count, version, rng) for version in (0, 1)]
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, write in (('before', legacy_write), ('after', bulk_write)):
+            speed, fields = run(os.path.join(tmp, f'{name}.db'), write, batches)
+            statements, _ = run(os.path.join(tmp, f'{name}-traced.db'), write, batches, trace=True)
+            results[name] = (speed, statements, fields)
+
+    print(f"{count} profiles, first crawl then a refresh with 10% changed")
+    for i, label in enumerate(('first crawl', 'refresh')):
+        print(f"  {label}:")
+        for name in ('before', 'after'):
+            speed, statements, _ = results[name]
+            print(f"    {name + ':':7} {speed[i]:,.0f} profiles/sec, {statements[i]:.2f} statements/profile")
+    print(f"  profile_fields rows after the refresh: before {results['before'][2]:,}, after {results['after'][2]:,}")
+
+if __name__ == "__main__":
+    main()